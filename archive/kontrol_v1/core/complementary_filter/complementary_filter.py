@@ -95,9 +95,7 @@ class ComplementaryFilter:
         self.filter1 = None
         self.filter2 = None
 
-    def zpk_fit_noise1(self, order,
-            differential_evolution_kwargs={"workers":-1,
-                                           "updating":"deferred"}):
+    def zpk_fit_noise1(self, order, differential_evolution_kwargs={}):
         """Fit noise1 with a ZPK model, set self.noise1.zpk_fit.
 
         Paramters
@@ -113,22 +111,12 @@ class ComplementaryFilter:
         scipy.optimize.OptimizeResult
             The result of the optimization
         """
-        res = self.zpk_fit(
-            f=self.f, noise_asd=self.noise1, order=order,
+        return self._zpk_fit_noise(
+            noise_index=1, order=order,
             differential_evolution_kwargs=differential_evolution_kwargs)
-        self.f_zpk_fit = self.f
-        zpk_args = res.x
-        self.noise1_zpk_fit = conversion.args2zpk(
-            f=self.f_zpk_fit, zpk_args=zpk_args)
-        self.noise1_zpk_fit = abs(self.noise1_zpk_fit)
-        self.noise1_zpk_control_tf = conversion.args2controltf(
-            zpk_args=zpk_args)
-        return res
 
-    def zpk_fit_noise2(self, order,
-            differential_evolution_kwargs={"workers":-1,
-                                           "updating":"deferred"}):
-        """Fit noise2 with a ZPK model, set self.noise1.zpk_fit.
+    def zpk_fit_noise2(self, order, differential_evolution_kwargs={}):
+        """Fit noise2 with a ZPK model, set self.noise2.zpk_fit.
 
         Paramters
         ---------
@@ -143,18 +131,106 @@ class ComplementaryFilter:
         scipy.optimize.OptimizeResult
             The result of the optimization
         """
+        return self._zpk_fit_noise(
+            noise_index=2, order=order,
+            differential_evolution_kwargs=differential_evolution_kwargs)
+
+    def zpk_fit_both(self, order, differential_evolution_kwargs={}):
+        """Fit noise1 and noise2 with ZPK models in one optimization.
+
+        Paramters
+        ---------
+        order: int
+            The order of the ZPK models
+        differential_evolution_kwargs: dict, optional
+            The keyword arguments passed to
+            scipy.optimize.differential_evolution during fitting.
+            See zpk_fit().
+
+        Returns
+        -------
+        scipy.optimize.OptimizeResult
+            The result of the optimization.
+            ``res.x`` are the parameters of noise1 followed by those
+            of noise2.
+            The fitted lists of zeros, poles, and gain are
+            ``res.zpk_args1`` and ``res.zpk_args2``.
+
+        Notes
+        -----
+        The cost is the sum of the two costs, which are independent.
+        So, this is equivalent to fitting them separately,
+        but the optimizer overhead is paid once and the population
+        evaluated in each call of the cost function is twice as large.
+        The search space has twice the dimension though,
+        so it usually takes more generations to converge than
+        zpk_fit_noise1() and zpk_fit_noise2() combined.
+        """
+        bounds1 = self._zpk_fit_bounds(f=self.f, order=order)
+        bounds2 = self._zpk_fit_bounds(f=self.f, order=order)
+        differential_evolution_kwargs, workers = self._zpk_fit_kwargs(
+            differential_evolution_kwargs)
+        cost1 = math.SortedZpkCost(
+            f=self.f, noise_asd=self.noise1, workers=workers, order=order)
+        cost2 = math.SortedZpkCost(
+            f=self.f, noise_asd=self.noise2, workers=workers, order=order)
+        n = len(bounds1)
+
+        def cost(x):
+            return cost1(x[:n]) + cost2(x[n:])
+
+        res = scipy.optimize.differential_evolution(
+            func=cost, bounds=bounds1+bounds2,
+            **differential_evolution_kwargs)
+        res.zpk_args1 = cost1.zpk_args(res.x[:n])
+        res.zpk_args2 = cost2.zpk_args(res.x[n:])
+        self._set_zpk_fit(noise_index=1, zpk_args=res.zpk_args1)
+        self._set_zpk_fit(noise_index=2, zpk_args=res.zpk_args2)
+        return res
+
+    def _zpk_fit_noise(self, noise_index, order, differential_evolution_kwargs):
+        """Fit noise1 or noise2 with a ZPK model and set the attributes.
+
+        Paramters
+        ---------
+        noise_index: int
+            1 for noise1 and 2 for noise2.
+        order: int
+            The order of the ZPK model
+        differential_evolution_kwargs: dict
+            The keyword arguments passed to
+            scipy.optimize.differential_evolution during fitting.
+
+        Returns
+        -------
+        scipy.optimize.OptimizeResult
+            The result of the optimization
+        """
+        noise_asd = getattr(self, "noise{}".format(noise_index))
         res = self.zpk_fit(
-            f=self.f, noise_asd=self.noise2, order=order,
+            f=self.f, noise_asd=noise_asd, order=order,
             differential_evolution_kwargs=differential_evolution_kwargs)
-        self.f_zpk_fit = self.f
-        zpk_args = res.x
-        self.noise2_zpk_fit = conversion.args2zpk(
-            f=self.f_zpk_fit, zpk_args=zpk_args)
-        self.noise2_zpk_fit = abs(self.noise2_zpk_fit)
-        self.noise2_zpk_control_tf = conversion.args2controltf(
-            zpk_args=zpk_args)
+        self._set_zpk_fit(noise_index=noise_index, zpk_args=res.zpk_args)
         return res
 
+    def _set_zpk_fit(self, noise_index, zpk_args):
+        """Set the ZPK fit attributes of noise1 or noise2.
+
+        Paramters
+        ---------
+        noise_index: int
+            1 for noise1 and 2 for noise2.
+        zpk_args: array
+            The fitted list of zeros, poles, and gain.
+        """
+        self.f_zpk_fit = self.f
+        zpk_fit = conversion.args2zpk(
+            f=self.f_zpk_fit, zpk_args=zpk_args, return_mag=True)
+        setattr(self, "noise{}_zpk_fit".format(noise_index), zpk_fit)
+        setattr(
+            self, "noise{}_zpk_control_tf".format(noise_index),
+            conversion.args2controltf(zpk_args=zpk_args))
+
     def zpk_fit(self, f, noise_asd, order, differential_evolution_kwargs={}):
         """Fit a noise ASD with a given model order using global optimization
 
@@ -169,81 +245,181 @@ class ComplementaryFilter:
         differential_evolution_kwargs: dict
             Keyword arguments passed to the differential evolution algorithm
             scipy.optimize.differential_evolution().
+            The defaults are tuned for the ZPK fit, i.e.
+            ``tol=1e-3``, ``mutation=(0.3, 1.0)``, ``recombination=0.9``,
+            ``init="sobol"``, ``polish=True``, and
+            ``callback=math.StallCallback()``,
+            which stops the search once the best cost stops improving.
+            Specified keys override the defaults.
+            The whole population is evaluated in one call of the cost
+            function by default, i.e. ``vectorized=True``.
+            In that case, ``workers`` is the number of threads used
+            to evaluate the population instead of processes.
 
         Returns
         -------
         res: scipy.optimize.OptimizeResult
             The result of the optimization.
+            The zeros and poles are searched as sorted log-spacings,
+            see conversion.delta_args2zpk_args(),
+            so ``res.x`` are the spacings.
+            The gain is not searched but computed from the zeros and poles,
+            see math.SortedZpkCost.
+            The fitted list of zeros, poles, and gain is ``res.zpk_args``.
+
+        Notes
+        -----
+        Zeros and poles are interchangeable,
+        so the search space is restricted to sorted zeros and poles.
+        This way, the optimizer doesn't search permutations of the
+        same model.
+        The zeros and poles are kept within [min(f), max(f)].
+        The spacings map the unit box uniformly to sorted zeros and poles
+        in [log10(min(f)), log10(max(f))].
+        So, the initial population is spread evenly over the decades of f
+        instead of crowding at the high frequency end.
         """
-        frequency_bounds = [(min(f), max(f))]*2*order
-        gain_bound = [(min(noise_asd)*1e-1, max(noise_asd)*1e1)]
-        bounds = frequency_bounds + gain_bound
+        bounds = self._zpk_fit_bounds(f=f, order=order)
+        differential_evolution_kwargs, workers = self._zpk_fit_kwargs(
+            differential_evolution_kwargs)
+        cost = math.SortedZpkCost(
+            f=f, noise_asd=noise_asd, workers=workers, order=order)
         res = scipy.optimize.differential_evolution(
-            func=math.zpk_fit_cost, args=(f, noise_asd), bounds=bounds,
-            **differential_evolution_kwargs)
+            func=cost, bounds=bounds, **differential_evolution_kwargs)
+        res.zpk_args = cost.zpk_args(res.x)
         return res
 
-    def tf_fit_noise1(self, minimize_kwargs={"method":"Powell"}):
+    @staticmethod
+    def _zpk_fit_bounds(f, order):
+        """The search bounds of the log-spacings.
+
+        The spacings are fractions of the log10-frequency span
+        [log10(min(f)), log10(max(f))],
+        see conversion.delta_args2zpk_args().
+
+        Parameters
+        ----------
+        f: array
+            The frequency axis.
+        order: int
+            The order of the ZPK model to be used.
+
+        Returns
+        -------
+        list of tuple
+            The bounds passed to scipy.optimize.differential_evolution().
+        """
+        return [(0, 1)]*2*order
+
+    @staticmethod
+    def _zpk_fit_kwargs(differential_evolution_kwargs):
+        """Merge the differential evolution keyword arguments over defaults.
+
+        Parameters
+        ----------
+        differential_evolution_kwargs: dict
+            Keyword arguments passed to the differential evolution algorithm
+            scipy.optimize.differential_evolution().
+
+        Returns
+        -------
+        differential_evolution_kwargs: dict
+            The merged keyword arguments.
+        workers: int
+            The number of threads used to evaluate the population.
+        """
+        default_kwargs = {
+            "tol": 1e-3,
+            "mutation": (0.3, 1.0),
+            "recombination": 0.9,
+            "init": "sobol",
+            "polish": True,
+            "vectorized": True,
+            "updating": "deferred",
+            "callback": math.StallCallback(),
+        }
+        differential_evolution_kwargs = dict(
+            default_kwargs, **differential_evolution_kwargs)
+        if differential_evolution_kwargs["vectorized"]:
+            workers = differential_evolution_kwargs.pop("workers", 1)
+        else:
+            workers = 1
+        return differential_evolution_kwargs, workers
+
+    def tf_fit_noise1(self, minimize_kwargs=None):
         """Fit noise1 with a transfer function, using the ZPK fit as initial.
 
         Parameters
         ----------
-        minimize_kwargs: dict, optional
+        minimize_kwargs: dict or None, optional
             keyword arguments passed to the scipy.optimize.minimize() method.
+            If None, scipy.optimize.least_squares() is used instead.
+            Defaults None.
 
         Returns
         -------
         res: scipy.optimize.OptimizeResult
             The result of optimization.
         """
-        num = self.noise1_zpk_control_tf.num[0][0]
-        den = self.noise1_zpk_control_tf.den[0][0]
-        tf_args_0 = np.concatenate((num, den))
-        log_tf_args_0 = np.log(tf_args_0)
-        res = self.tf_fit(
-            f=self.f, noise_asd=self.noise1, x0=log_tf_args_0,
-            minimize_kwargs=minimize_kwargs)
-        self.f_tf_fit = self.f
-        tf_args = np.exp(res.x)
-        self.noise1_tf_fit = conversion.args2tf(
-            f=self.f_tf_fit, tf_args=tf_args)
-        self.noise1_tf_fit = abs(self.noise1_tf_fit)
-        num = tf_args[:int(len(tf_args)/2)]
-        den = tf_args[int(len(tf_args)/2):]
-        self.noise1_tf = control.tf(num, den)
-        return res
+        return self._tf_fit_noise(
+            noise_index=1, minimize_kwargs=minimize_kwargs)
 
-    def tf_fit_noise2(self, minimize_kwargs={"method":"Powell"}):
-        """Fit noise1 with a transfer function, using the ZPK fit as initial.
+    def tf_fit_noise2(self, minimize_kwargs=None):
+        """Fit noise2 with a transfer function, using the ZPK fit as initial.
 
         Parameters
         ----------
-        minimize_kwargs: dict, optional
+        minimize_kwargs: dict or None, optional
             keyword arguments passed to the scipy.optimize.minimize() method.
+            If None, scipy.optimize.least_squares() is used instead.
+            Defaults None.
 
         Returns
         -------
         res: scipy.optimize.OptimizeResult
             The result of optimization.
         """
-        num = self.noise2_zpk_control_tf.num[0][0]
-        den = self.noise2_zpk_control_tf.den[0][0]
+        return self._tf_fit_noise(
+            noise_index=2, minimize_kwargs=minimize_kwargs)
+
+    def _tf_fit_noise(self, noise_index, minimize_kwargs):
+        """Fit noise1 or noise2 with a transfer function and set attributes.
+
+        Parameters
+        ----------
+        noise_index: int
+            1 for noise1 and 2 for noise2.
+        minimize_kwargs: dict or None
+            keyword arguments passed to the scipy.optimize.minimize() method.
+            If None, scipy.optimize.least_squares() is used instead.
+
+        Returns
+        -------
+        res: scipy.optimize.OptimizeResult
+            The result of optimization.
+        """
+        noise_asd = getattr(self, "noise{}".format(noise_index))
+        zpk_control_tf = getattr(
+            self, "noise{}_zpk_control_tf".format(noise_index))
+        num = zpk_control_tf.num[0][0]
+        den = zpk_control_tf.den[0][0]
         tf_args_0 = np.concatenate((num, den))
         log_tf_args_0 = np.log(tf_args_0)
         res = self.tf_fit(
-            f=self.f, noise_asd=self.noise2, x0=log_tf_args_0,
+            f=self.f, noise_asd=noise_asd, x0=log_tf_args_0,
             minimize_kwargs=minimize_kwargs)
         self.f_tf_fit = self.f
         tf_args = np.exp(res.x)
-        self.noise2_tf_fit = conversion.args2tf(
-            f=self.f_tf_fit, tf_args=tf_args)
-        self.noise2_tf_fit = abs(self.noise2_tf_fit)
+        tf_fit = conversion.args2tf(
+            f=self.f_tf_fit, tf_args=tf_args, return_mag=True)
+        setattr(self, "noise{}_tf_fit".format(noise_index), tf_fit)
         num = tf_args[:int(len(tf_args)/2)]
         den = tf_args[int(len(tf_args)/2):]
-        self.noise2_tf = control.tf(num, den)
+        setattr(
+            self, "noise{}_tf".format(noise_index), control.tf(num, den))
         return res
 
-    def tf_fit(self, f, noise_asd, x0, minimize_kwargs={}):
+    def tf_fit(self, f, noise_asd, x0, minimize_kwargs=None, sk_iter=15):
         """Fit a noise ASD with a given model order using global optimization
 
         Parameters
@@ -253,19 +429,52 @@ class ComplementaryFilter:
         noise_asd: array
             The noise ASD.
         x0: array
-            Initial guess of the numerator and denominators
-        minimize_kwargs: dict
+            Initial guess of the numerator and denominators, "logged".
+        minimize_kwargs: dict or None, optional
             Keyword arguments passed to the minimize algorithm
             scipy.optimize.minimize().
+            If None, the log residuals are minimized with
+            scipy.optimize.least_squares(method="trf") instead,
+            which makes use of the sum-of-squares structure of the cost,
+            with the analytic Jacobian math.TfCost.jac().
+            Defaults None.
+        sk_iter: int, optional
+            Number of Sanathanan-Koerner iterations used to refine
+            the initial guess before the nonlinear optimization.
+            Set 0 to use x0 as is.
+            Defaults 15.
 
         Returns
         -------
         res: scipy.optimize.OptimizeResult
             The result of the optimization.
+
+        Notes
+        -----
+        The noise ASD has no phase,
+        so the phase of the initial guess is borrowed for the linear
+        Sanathanan-Koerner fit, see math.sk_tf_fit().
+        The refined guess is used only if all coefficients are positive
+        and it has a lower cost than x0.
         """
-        res = scipy.optimize.minimize(
-            fun=math.tf_fit_cost, args=(f, noise_asd), x0=x0,
-            **minimize_kwargs)
+        cost = math.TfCost(f=f, noise_asd=noise_asd)
+        if sk_iter > 0:
+            tf_args_0 = np.exp(x0)
+            order = int(len(tf_args_0)/2) - 1
+            phase = np.angle(conversion.args2tf(f=f, tf_args=tf_args_0))
+            num, den = math.sk_tf_fit(
+                f=f, h=noise_asd*np.exp(1j*phase), num_order=order,
+                den_order=order, n_iter=sk_iter)
+            tf_args_sk = np.concatenate((num, den))
+            if np.all(tf_args_sk > 0):
+                log_tf_args_sk = np.log(tf_args_sk)
+                if cost(log_tf_args_sk) < cost(x0):
+                    x0 = log_tf_args_sk
+        if minimize_kwargs is None:
+            res = scipy.optimize.least_squares(
+                fun=cost.residual, x0=x0, jac=cost.jac, method="trf")
+        else:
+            res = scipy.optimize.minimize(fun=cost, x0=x0, **minimize_kwargs)
         return res
 
     def synthesis(self):
@@ -4,7 +4,7 @@ import control
 import numpy as np
 
 
-def args2zpk(f, zpk_args):
+def args2zpk(f, zpk_args, return_mag=False):
     """Returns an array of ZPK defined transfer function evaluted at frequency f.
 
     Parameters
@@ -14,20 +14,240 @@ def args2zpk(f, zpk_args):
     zpk_args: array
         A 1-D list of zeros, poles, and gain.
         Zeros and poles are in unit of Hz.
+        Or, a 2-D array of shape (len(zpk_args), S), with S such lists
+        stacked as columns, e.g. the population passed by
+        scipy.optimize.differential_evolution(vectorized=True).
+    return_mag: boolean, optional
+        Return the magnitude instead.
+        It's evaluated with real arithmetic, see args2zpk_mag2().
+        Defaults False.
+
+    Returns
+    -------
+    zpk: array
+        A complex array, or a real array if return_mag is True.
+        Has shape (len(f),) if zpk_args is 1-D, (S, len(f)) otherwise.
+    """
+    if return_mag:
+        return np.sqrt(args2zpk_mag2(f=f, zpk_args=zpk_args))
+    s = 1j*2*np.pi*np.asarray(f)
+    return s2zpk(s=s, zpk_args=zpk_args)
+
+
+def s2zpk(s, zpk_args):
+    """Returns an array of ZPK defined transfer function evaluted at s.
+
+    Parameters
+    ----------
+    s: array
+        The complex frequency axis, i.e. 1j*2*np.pi*f.
+    zpk_args: array
+        A 1-D list of zeros, poles, and gain, or a 2-D array of such lists
+        stacked as columns. See args2zpk().
+        Zeros and poles are in unit of Hz.
 
     Returns
     -------
     zpk: array
         A complex array.
+        Has shape (len(s),) if zpk_args is 1-D, (S, len(s)) otherwise.
     """
-    s = 1j*2*np.pi*f
-    zeros = zpk_args[:int(len(zpk_args)/2)]
-    poles = zpk_args[int(len(zpk_args)/2):len(zpk_args)-1]
-    gain = zpk_args[-1]
-    zpk = np.prod([(s/(2*np.pi*z)+1)/(s/(2*np.pi*p)+1)
-                  for z,p in zip(zeros, poles)], axis=0)
-    zpk *= gain
-    return zpk
+    zpk_args = np.asarray(zpk_args)
+    return ZpkEval(order=int(len(zpk_args)/2))(s=s, zpk_args=zpk_args)
+
+
+def args2zpk_mag2(f, zpk_args):
+    """Returns the squared magnitude of a ZPK defined transfer function.
+
+    Parameters
+    ----------
+    f: array
+        The frequency axis.
+    zpk_args: array
+        A 1-D list of zeros, poles, and gain, or a 2-D array of such lists
+        stacked as columns. See args2zpk().
+        Zeros and poles are in unit of Hz.
+
+    Returns
+    -------
+    array
+        abs(args2zpk(f, zpk_args))**2, evaluated with real arithmetic.
+    """
+    w2 = (2*np.pi*np.asarray(f))**2
+    return w2zpk_mag2(w2=w2, zpk_args=zpk_args)
+
+
+def w2zpk_mag2(w2, zpk_args):
+    """Returns the squared magnitude of a ZPK defined transfer function.
+
+    Parameters
+    ----------
+    w2: array
+        The squared angular frequency axis, i.e. (2*np.pi*f)**2.
+    zpk_args: array
+        A 1-D list of zeros, poles, and gain, or a 2-D array of such lists
+        stacked as columns. See args2zpk().
+        Zeros and poles are in unit of Hz.
+
+    Returns
+    -------
+    array
+        abs(s2zpk(s, zpk_args))**2.
+        Has shape (len(w2),) if zpk_args is 1-D, (S, len(w2)) otherwise.
+
+    Notes
+    -----
+    abs(1j*w/wz+1)**2 = 1 + w**2/wz**2 is real,
+    so no complex number is involved.
+    """
+    zpk_args = np.asarray(zpk_args)
+    return ZpkEval(order=int(len(zpk_args)/2)).mag2(w2=w2, zpk_args=zpk_args)
+
+
+class ZpkEval:
+    """Evaluate ZPK defined transfer functions of a fixed order.
+
+    The slices of zeros, poles, and gain in zpk_args are
+    bound once here instead of every time the function is evaluated.
+
+    Parameters
+    ----------
+    order: int
+        The number of zeros, which is also the number of poles.
+    """
+    def __init__(self, order):
+        """Constructor
+
+        Parameters
+        ----------
+        order: int
+            The number of zeros, which is also the number of poles.
+        """
+        self.order = order
+        self._zeros = slice(0, order)
+        self._poles = slice(order, 2*order)
+
+    def split(self, zpk_args):
+        """Split zpk_args into zeros, poles, and gain.
+
+        Parameters
+        ----------
+        zpk_args: array
+            A 1-D list of zeros, poles, and gain, or a 2-D array of such
+            lists stacked as columns. See args2zpk().
+
+        Returns
+        -------
+        zeros: array
+            The zeros, with a trailing axis for broadcasting against s.
+        poles: array
+            The poles, with a trailing axis for broadcasting against s.
+        gain: array
+            The gain, with a trailing axis for broadcasting against s.
+        """
+        zpk_args = np.asarray(zpk_args)
+        zeros = zpk_args[self._zeros, ..., np.newaxis]
+        poles = zpk_args[self._poles, ..., np.newaxis]
+        gain = zpk_args[-1, ..., np.newaxis]
+        return zeros, poles, gain
+
+    def __call__(self, s, zpk_args):
+        """Returns an array of the transfer function evaluted at s.
+
+        Parameters
+        ----------
+        s: array
+            The complex frequency axis, i.e. 1j*2*np.pi*f.
+        zpk_args: array
+            A 1-D list of zeros, poles, and gain, or a 2-D array of such
+            lists stacked as columns. See args2zpk().
+            Zeros and poles are in unit of Hz.
+
+        Returns
+        -------
+        zpk: array
+            A complex array.
+            Has shape (len(s),) if zpk_args is 1-D, (S, len(s)) otherwise.
+        """
+        zeros, poles, gain = self.split(zpk_args)
+        inv_wz = 1/(2*np.pi*zeros)
+        inv_wp = 1/(2*np.pi*poles)
+        num = s*inv_wz + 1
+        den = s*inv_wp + 1
+        zpk = gain * np.prod(num/den, axis=0)
+        return zpk
+
+    def mag2(self, w2, zpk_args):
+        """Returns the squared magnitude of the transfer function.
+
+        Parameters
+        ----------
+        w2: array
+            The squared angular frequency axis, i.e. (2*np.pi*f)**2.
+        zpk_args: array
+            A 1-D list of zeros, poles, and gain, or a 2-D array of such
+            lists stacked as columns. See args2zpk().
+            Zeros and poles are in unit of Hz.
+
+        Returns
+        -------
+        array
+            The squared magnitude.
+            Has shape (len(w2),) if zpk_args is 1-D, (S, len(w2)) otherwise.
+        """
+        zeros, poles, gain = self.split(zpk_args)
+        inv_wz2 = 1/(2*np.pi*zeros)**2
+        inv_wp2 = 1/(2*np.pi*poles)**2
+        num = w2*inv_wz2 + 1
+        den = w2*inv_wp2 + 1
+        mag2 = gain**2 * np.prod(num/den, axis=0)
+        return mag2
+
+
+def delta_args2zpk_args(delta_args, f_min, f_max):
+    """Convert sorted log-spacings of zeros and poles to zpk_args.
+
+    Parameters
+    ----------
+    delta_args: array
+        A 1-D list of log-spacings of zeros, log-spacings of poles, and gain,
+        or a 2-D array of such lists stacked as columns.
+        The spacings in [0, 1] set the fraction of the log10-frequency
+        span left between the previous zero and f_max,
+        i.e. the log10-frequency of the i-th of n zeros,
+        normalized to [0, 1], is
+        ``1 - np.prod((1-delta_args[:i+1])**(1/np.arange(n, n-i-1, -1)))``.
+        Same goes to the poles.
+        So, the zeros and poles are sorted and within [f_min, f_max].
+        Spacings drawn uniformly from [0, 1] give zeros and poles
+        spread uniformly over the decades between f_min and f_max,
+        i.e. the sorted samples of a uniform distribution in
+        [log10(f_min), log10(f_max)].
+    f_min: float
+        The frequency where the spacings start.
+    f_max: float
+        The frequency where the spacings end.
+
+    Returns
+    -------
+    zpk_args: array
+        The list(s) of zeros, poles, and gain.
+        Zeros and poles are in unit of Hz.
+    """
+    delta_args = np.asarray(delta_args)
+    order = int(len(delta_args)/2)
+    log_f_min = np.log10(f_min)
+    log_f_span = np.log10(f_max) - log_f_min
+    # The i-th of the n remaining sorted uniform samples is the minimum of
+    # them, which has the cumulative distribution 1-(1-x)**n.
+    inv_n = 1 / np.arange(order, 0, -1)
+    inv_n = np.reshape(inv_n, (order,)+(1,)*(delta_args.ndim-1))
+    zpk_args = np.empty_like(delta_args)
+    for roots in (slice(0, order), slice(order, 2*order)):
+        remaining = np.cumprod((1-delta_args[roots])**inv_n, axis=0)
+        zpk_args[roots] = 10**(log_f_min + log_f_span*(1-remaining))
+    zpk_args[-1] = delta_args[-1]
+    return zpk_args
 
 
 def args2controltf(zpk_args):
@@ -39,17 +259,20 @@ def args2controltf(zpk_args):
         A 1-D list of zeros, poles, and gain.
         Zeros and poles are in unit of Hz.
     """
-    s = control.tf("s")
-    zeros = zpk_args[:int(len(zpk_args)/2)]
-    poles = zpk_args[int(len(zpk_args)/2):len(zpk_args)-1]
+    zeros = np.asarray(zpk_args[:int(len(zpk_args)/2)])
+    poles = np.asarray(zpk_args[int(len(zpk_args)/2):len(zpk_args)-1])
     gain = zpk_args[-1]
-    zpk = np.prod([(s/(2*np.pi*z)+1)/(s/(2*np.pi*p)+1)
-                  for z,p in zip(zeros, poles)], axis=0)
-    zpk *= gain
+    wz = 2*np.pi*zeros
+    wp = 2*np.pi*poles
+    # s/wz+1 = (s+wz)/wz, so the polynomials are built from the roots
+    # in one go instead of multiplying control.tf objects.
+    num = gain * np.poly(-wz) / np.prod(wz)
+    den = np.poly(-wp) / np.prod(wp)
+    zpk = control.tf(num, den)
     return zpk
 
 
-def args2tf(f, tf_args):
+def args2tf(f, tf_args, return_mag=False):
     """Returns an array of transfer function evaluted at frequency f.
 
     Parameters
@@ -59,17 +282,86 @@ def args2tf(f, tf_args):
     tf_args: array
         A 1-D list of numerator and denominator coefficients,
         from higher order to lower order.
+    return_mag: boolean, optional
+        Return the magnitude instead.
+        It's evaluated with real arithmetic, see args2tf_mag2().
+        Defaults False.
 
     Returns
     -------
     array
-        A complex array.
+        A complex array, or a real array if return_mag is True.
     """
+    if return_mag:
+        return np.sqrt(args2tf_mag2(f=f, tf_args=tf_args))
     s = 1j*2*np.pi*f
+    return s2tf(s=s, tf_args=tf_args)
+
+
+def s2tf(s, tf_args):
+    """Returns an array of transfer function evaluted at s.
+
+    Parameters
+    ----------
+    s: array
+        The complex frequency axis, i.e. 1j*2*np.pi*f.
+    tf_args: array
+        A 1-D list of numerator and denominator coefficients,
+        from higher order to lower order.
+
+    Returns
+    -------
+    array
+        A complex array.
+    """
     num_coef = tf_args[:int(len(tf_args)/2)]
     den_coef = tf_args[int(len(tf_args)/2):len(tf_args)]
-#     print(num_coef)
-#     print(den_coef)
-    num = np.sum([np.flip(num_coef)[i] * s**i for i in range(len(num_coef))], axis=0)
-    den = np.sum([np.flip(den_coef)[i] * s**i for i in range(len(den_coef))], axis=0)
+    num = np.polyval(num_coef, s)
+    den = np.polyval(den_coef, s)
     return num/den
+
+
+def args2tf_mag2(f, tf_args):
+    """Returns the squared magnitude of a transfer function at frequency f.
+
+    Parameters
+    ----------
+    f: array
+        The frequency axis.
+    tf_args: array
+        A 1-D list of numerator and denominator coefficients,
+        from higher order to lower order.
+
+    Returns
+    -------
+    array
+        abs(args2tf(f, tf_args))**2, evaluated with real arithmetic.
+    """
+    w2 = (2*np.pi*np.asarray(f))**2
+    num_coef = tf_args[:int(len(tf_args)/2)]
+    den_coef = tf_args[int(len(tf_args)/2):len(tf_args)]
+    num = np.polyval(mag2_poly(num_coef), -w2)
+    den = np.polyval(mag2_poly(den_coef), -w2)
+    return num/den
+
+
+def mag2_poly(coef):
+    """Returns the polynomial of s**2 that equals abs(P(s))**2 on s=1j*w.
+
+    Parameters
+    ----------
+    coef: array
+        The coefficients of the real polynomial P(s),
+        from higher order to lower order.
+
+    Returns
+    -------
+    array
+        The coefficients of P(s)*P(-s) as a polynomial of s**2,
+        from higher order to lower order.
+        Evaluate it at -w**2 to get abs(P(1j*w))**2.
+    """
+    coef = np.asarray(coef)
+    sign = (-1)**np.arange(len(coef)-1, -1, -1)
+    # P(s)*P(-s) is even, so the odd order coefficients are zeros.
+    return np.polymul(coef, sign*coef)[::2]
@@ -1,5 +1,8 @@
 """Simple maths for complementary filter synthesis
 """
+import concurrent.futures
+import os
+
 import numpy as np
 
 import kontrol.core.complementary_filter.conversion as conversion
@@ -20,7 +23,58 @@ def log_mse(x1, x2):
     float
         The logarithmic mean square error between x1 and x2.
     """
-    return np.mean((np.log(x1)-np.log(x2))**2)
+    residual = np.log(x1)
+    residual -= np.log(x2)
+    np.square(residual, out=residual)
+    return np.mean(residual)
+
+
+def log_mse_from_complex(x1, x2):
+    """Returns the logarithmic mean square error between x1 and abs(x2).
+
+    Parameters
+    ----------
+    x1: array
+        Array 1
+    x2: array
+        Complex array 2.
+        May be 2-D, in which case the error is evaluated along the
+        last axis.
+
+    Returns
+    -------
+    float or array
+        The logarithmic mean square error between x1 and abs(x2).
+    """
+    return _log_mse_from_complex(log_x1=np.log(x1), x2=x2)
+
+
+def _log_mse_from_complex(log_x1, x2):
+    """log_mse_from_complex() with np.log(x1) precomputed.
+
+    np.log(abs(x2)) is evaluated as 0.5*np.log(x2.real**2 + x2.imag**2)
+    so no square root is taken.
+    The residual is computed in place in a single real buffer.
+    """
+    residual = np.square(x2.real)
+    residual += np.square(x2.imag)
+    np.log(residual, out=residual)
+    residual *= 0.5
+    residual -= log_x1
+    np.square(residual, out=residual)
+    return np.mean(residual, axis=-1)
+
+
+def _log_mse_from_mag2(log_x1, x2_mag2):
+    """Logarithmic mean square error between exp(log_x1) and sqrt(x2_mag2).
+
+    The residual is computed in place in a single real buffer.
+    """
+    residual = np.log(x2_mag2)
+    residual *= 0.5
+    residual -= log_x1
+    np.square(residual, out=residual)
+    return np.mean(residual, axis=-1)
 
 
 def zpk_fit_cost(zpk_args, f, noise_asd):
@@ -41,8 +95,32 @@ def zpk_fit_cost(zpk_args, f, noise_asd):
     The logarithmic mean square error between the noise ASD and the magnitude
     of ZPK model.
     """
-    zpk = conversion.args2zpk(f=f, zpk_args=zpk_args)
-    return log_mse(x1=noise_asd, x2=abs(zpk))
+    return zpk_fit_cost_vec(zpk_args=zpk_args, f=f, noise_asd=noise_asd)
+
+
+def zpk_fit_cost_vec(zpk_args, f, noise_asd):
+    """Vectorized cost function for fitting a noise ASD with zpk.
+
+    Parameters
+    ----------
+    zpk_args: array
+        A 2-D array of shape (len(zpk_args), S), with S lists of
+        zeros, poles, and gain stacked as columns.
+        Or, a 1-D list of zeros, poles, and gain.
+        Zeros and poles are in unit of Hz.
+    f: array
+        The frequency axis.
+    noise_asd: array
+        The noise ASD.
+
+    Returns
+    -------
+    array or float
+        The logarithmic mean square errors between the noise ASD and the
+        magnitude of the S ZPK models.
+        A float if zpk_args is 1-D.
+    """
+    return ZpkCost(f=f, noise_asd=noise_asd)(zpk_args)
 
 
 def tf_fit_cost(log_tf_args, f, noise_asd):
@@ -62,6 +140,477 @@ def tf_fit_cost(log_tf_args, f, noise_asd):
     The logarithmic mean square error between the noise ASD and the magnitude
     of TF model.
     """
-    tf_args = np.exp(log_tf_args)
-    tf = conversion.args2tf(f=f, tf_args=tf_args)
-    return log_mse(x1=noise_asd, x2=abs(tf))
+    return TfCost(f=f, noise_asd=noise_asd)(log_tf_args)
+
+
+def tf_fit_residual(log_tf_args, f, noise_asd):
+    """Residual for fitting transfer function to the noise ASD
+
+    Parameters
+    ----------
+    log_tf_args: array
+        A list of numerator and denominator coefficients, "logged".
+    f: array
+        The frequency axis.
+    noise_asd: array
+        The noise ASD.
+
+    Returns
+    -------
+    array
+        The log difference between the noise ASD and the magnitude of the
+        TF model at each frequency.
+    """
+    return TfCost(f=f, noise_asd=noise_asd).residual(log_tf_args)
+
+
+def tf_fit_jac(log_tf_args, f, noise_asd):
+    """Jacobian of tf_fit_residual() with respect to log_tf_args.
+
+    Parameters
+    ----------
+    log_tf_args: array
+        A list of numerator and denominator coefficients, "logged".
+    f: array
+        The frequency axis.
+    noise_asd: array
+        The noise ASD.
+
+    Returns
+    -------
+    array
+        The Jacobian matrix with shape (len(f), len(log_tf_args)).
+    """
+    return TfCost(f=f, noise_asd=noise_asd).jac(log_tf_args)
+
+
+def sk_tf_fit(f, h, num_order, den_order, n_iter=15):
+    """Fit a frequency response with a transfer function, linearly.
+
+    Uses the Sanathanan-Koerner iteration.
+    Each iteration solves the linear least squares problem
+    min sum(abs(h*A(s)-B(s))**2 / abs(A_prev(s))**2),
+    where B and A are the numerator and denominator, and A_prev is the
+    denominator of the previous iteration.
+
+    Parameters
+    ----------
+    f: array
+        The frequency axis.
+    h: array
+        The complex frequency response to be fitted.
+    num_order: int
+        Order of the numerator.
+    den_order: int
+        Order of the denominator.
+    n_iter: int, optional
+        Number of iterations.
+        Defaults 15.
+
+    Returns
+    -------
+    num: array
+        Numerator coefficients, from higher order to lower order.
+    den: array
+        Denominator coefficients, from higher order to lower order.
+        The constant term is normalized to 1.
+    """
+    s = 1j*2*np.pi*np.asarray(f)
+    h = np.asarray(h)
+    # Normalize s to keep the Vandermonde matrices well-conditioned.
+    w_scale = np.max(abs(s))
+    s_norm = s / w_scale
+    s_num = s_norm[:, np.newaxis] ** np.arange(num_order, -1, -1)
+    s_den = s_norm[:, np.newaxis] ** np.arange(den_order, 0, -1)
+    h_s_den = h[:, np.newaxis] * s_den
+    weight = np.ones(len(s))
+    for _ in range(n_iter):
+        # h*(A'(s)+1) = B(s), where A'(s) is A(s) without the constant term.
+        a = np.hstack((s_num, -h_s_den)) / weight[:, np.newaxis]
+        b = h / weight
+        a = np.vstack((a.real, a.imag))
+        b = np.concatenate((b.real, b.imag))
+        x = np.linalg.lstsq(a, b, rcond=None)[0]
+        num = x[:num_order+1]
+        den = np.append(x[num_order+1:], 1)
+        weight = abs(np.polyval(den, s_norm))
+    num = num / w_scale**np.arange(num_order, -1, -1)
+    den = den / w_scale**np.arange(den_order, -1, -1)
+    return num, den
+
+
+class ZpkCost:
+    """Cost function for fitting a noise ASD with zpk.
+
+    ``(2*np.pi*f)**2`` and ``np.log(noise_asd)`` are evaluated once here,
+    instead of every time the cost is evaluated by the optimizer.
+    Only the magnitude of the ZPK model matters,
+    so it's evaluated with real arithmetic, see conversion.w2zpk_mag2().
+
+    Parameters
+    ----------
+    f: array
+        The frequency axis.
+    noise_asd: array
+        The noise ASD.
+    workers: int, optional
+        Number of threads used to evaluate a 2-D population of zpk_args.
+        The population is split into this many chunks.
+        -1 uses all available CPUs.
+        Defaults 1.
+    order: int, optional
+        The number of zeros, which is also the number of poles.
+        If None, it's derived from the first zpk_args evaluated.
+        Defaults None.
+    """
+    def __init__(self, f, noise_asd, workers=1, order=None):
+        """Constructor
+
+        Parameters
+        ----------
+        f: array
+            The frequency axis.
+        noise_asd: array
+            The noise ASD.
+        workers: int, optional
+            Number of threads used to evaluate a 2-D population of zpk_args.
+            The population is split into this many chunks.
+            -1 uses all available CPUs.
+            Defaults 1.
+        order: int, optional
+            The number of zeros, which is also the number of poles.
+            If None, it's derived from the first zpk_args evaluated.
+            Defaults None.
+        """
+        self._w2 = (2*np.pi*np.asarray(f))**2
+        self._log_noise = np.log(noise_asd)
+        if workers == -1:
+            workers = os.cpu_count()
+        self._workers = workers
+        if order is None:
+            self._zpk_eval = None
+        else:
+            self._zpk_eval = conversion.ZpkEval(order=order)
+
+    def __call__(self, zpk_args):
+        """Evaluate the cost function.
+
+        Parameters
+        ----------
+        zpk_args: array
+            A 1-D list of zeros, poles, and gain, or a 2-D array of shape
+            (len(zpk_args), S), with S such lists stacked as columns.
+            Zeros and poles are in unit of Hz.
+
+        Returns
+        -------
+        array or float
+            The logarithmic mean square error between the noise ASD and the
+            magnitude of the ZPK model(s).
+        """
+        zpk_args = np.asarray(zpk_args)
+        if self._zpk_eval is None:
+            self._zpk_eval = conversion.ZpkEval(order=int(len(zpk_args)/2))
+        if zpk_args.ndim == 2 and self._workers > 1:
+            # NumPy releases the GIL, so threads evaluate the chunks
+            # concurrently without pickling anything.
+            chunks = np.array_split(zpk_args, self._workers, axis=1)
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._workers) as executor:
+                costs = executor.map(self._cost, chunks)
+            return np.concatenate(list(costs))
+        return self._cost(zpk_args)
+
+    def _cost(self, zpk_args):
+        """Evaluate the cost function in the calling thread."""
+        zpk_mag2 = self._zpk_eval.mag2(w2=self._w2, zpk_args=zpk_args)
+        return _log_mse_from_mag2(log_x1=self._log_noise, x2_mag2=zpk_mag2)
+
+
+class SortedZpkCost(ZpkCost):
+    """ZpkCost with zeros and poles parametrized by sorted log-spacings.
+
+    Zeros and poles are interchangeable, so any permutation of them
+    is the same model.
+    Parametrizing them by log-spacings within the span of f,
+    see conversion.delta_args2zpk_args(),
+    leaves one representative per permutation.
+    The zeros and poles are always within [min(f), max(f)].
+
+    The gain is not a parameter.
+    For given zeros and poles, the gain that minimizes the logarithmic
+    mean square error is exp(mean(log(noise_asd) - log(abs(H0)))),
+    where H0 is the model with unity gain.
+    The minimized error is then the variance of
+    log(noise_asd) - log(abs(H0)), which is what is returned.
+
+    Parameters
+    ----------
+    f: array
+        The frequency axis.
+    noise_asd: array
+        The noise ASD.
+    workers: int, optional
+        Number of threads used to evaluate a 2-D population of delta_args.
+        Defaults 1.
+    order: int, optional
+        The number of zeros, which is also the number of poles.
+        If None, it's derived from the first delta_args evaluated.
+        Defaults None.
+    """
+    def __init__(self, f, noise_asd, workers=1, order=None):
+        """Constructor
+
+        Parameters
+        ----------
+        f: array
+            The frequency axis.
+        noise_asd: array
+            The noise ASD.
+        workers: int, optional
+            Number of threads used to evaluate a 2-D population of
+            delta_args.
+            Defaults 1.
+        order: int, optional
+            The number of zeros, which is also the number of poles.
+            If None, it's derived from the first delta_args evaluated.
+            Defaults None.
+        """
+        super().__init__(
+            f=f, noise_asd=noise_asd, workers=workers, order=order)
+        self._f_min = np.min(f)
+        self._f_max = np.max(f)
+
+    def __call__(self, delta_args):
+        """Evaluate the cost function.
+
+        Parameters
+        ----------
+        delta_args: array
+            A 1-D list of log-spacings of zeros and log-spacings of poles,
+            or a 2-D array of such lists stacked as columns.
+
+        Returns
+        -------
+        array or float
+            The logarithmic mean square error between the noise ASD and the
+            magnitude of the ZPK model(s) with the optimal gain.
+        """
+        return super().__call__(self.zpk_args(delta_args, gain=1))
+
+    def zpk_args(self, delta_args, gain=None):
+        """Convert log-spacings to zpk_args.
+
+        Parameters
+        ----------
+        delta_args: array
+            A 1-D list of log-spacings of zeros and log-spacings of poles,
+            or a 2-D array of such lists stacked as columns.
+        gain: float or array, optional
+            The gain.
+            If None, the optimal gain is used.
+            Defaults None.
+
+        Returns
+        -------
+        array
+            The list(s) of zeros, poles, and gain.
+        """
+        delta_args = np.asarray(delta_args)
+        if gain is None:
+            unity_zpk_args = self.zpk_args(delta_args, gain=1)
+            gain = np.exp(np.mean(self._log_residual(unity_zpk_args), axis=-1))
+        gain = np.broadcast_to(gain, (1,)+delta_args.shape[1:])
+        delta_args = np.concatenate((delta_args, gain))
+        return conversion.delta_args2zpk_args(
+            delta_args=delta_args, f_min=self._f_min, f_max=self._f_max)
+
+    def _log_residual(self, zpk_args):
+        """log(noise_asd) - log(abs(zpk)), in place in a single buffer."""
+        residual = np.log(self._zpk_eval.mag2(w2=self._w2, zpk_args=zpk_args))
+        residual *= -0.5
+        residual += self._log_noise
+        return residual
+
+    def _cost(self, zpk_args):
+        """Evaluate the cost function in the calling thread."""
+        return np.var(self._log_residual(zpk_args), axis=-1)
+
+
+class TfCost:
+    """Cost function for fitting a noise ASD with a transfer function.
+
+    ``(2*np.pi*f)**2`` and ``np.log(noise_asd)`` are evaluated once here,
+    instead of every time the cost is evaluated by the optimizer.
+    Only the magnitude of the TF model matters, so abs(P(1j*w))**2 of
+    the numerator and denominator are evaluated as real polynomials of
+    -w**2, see conversion.mag2_poly().
+    The Vandermonde matrix of -w**2 is cached so the numerator and
+    denominator are evaluated with a single matrix product.
+
+    Parameters
+    ----------
+    f: array
+        The frequency axis.
+    noise_asd: array
+        The noise ASD.
+    """
+    def __init__(self, f, noise_asd):
+        """Constructor
+
+        Parameters
+        ----------
+        f: array
+            The frequency axis.
+        noise_asd: array
+            The noise ASD.
+        """
+        self._w2 = (2*np.pi*np.asarray(f))**2
+        self._log_noise = np.log(noise_asd)
+        self._vander = np.empty((0, len(self._w2)))
+        self._s_vander = np.empty((0, len(self._w2)), dtype=complex)
+
+    def _tf_mag2(self, tf_args):
+        """Evaluate abs(tf)**2 with the cached Vandermonde matrix.
+
+        Parameters
+        ----------
+        tf_args: array
+            A list of numerator and denominator coefficients,
+            from higher order to lower order.
+
+        Returns
+        -------
+        array
+            The squared magnitude of the transfer function.
+        """
+        n = int(len(tf_args)/2)
+        if len(self._vander) != n:
+            # Rows are (-w**2)**(n-1), ..., (-w**2)**0.
+            self._vander = np.ascontiguousarray(np.vander(-self._w2, n).T)
+        mag2_coef = [
+            conversion.mag2_poly(tf_args[:n]),
+            conversion.mag2_poly(tf_args[n:]),
+        ]
+        num_mag2, den_mag2 = mag2_coef @ self._vander
+        return num_mag2/den_mag2
+
+    def __call__(self, log_tf_args):
+        """Evaluate the cost function.
+
+        Parameters
+        ----------
+        log_tf_args: array
+            A list of numerator and denominator coefficients, "logged".
+
+        Returns
+        -------
+        float
+            The logarithmic mean square error between the noise ASD and
+            the magnitude of TF model.
+        """
+        tf_args = np.exp(log_tf_args)
+        tf_mag2 = self._tf_mag2(tf_args)
+        return _log_mse_from_mag2(log_x1=self._log_noise, x2_mag2=tf_mag2)
+
+    def residual(self, log_tf_args):
+        """Evaluate the residual vector for least squares optimizers.
+
+        Parameters
+        ----------
+        log_tf_args: array
+            A list of numerator and denominator coefficients, "logged".
+
+        Returns
+        -------
+        array
+            np.log(noise_asd) - np.log(abs(tf)) at each frequency.
+        """
+        tf_args = np.exp(log_tf_args)
+        residual = np.log(self._tf_mag2(tf_args))
+        residual *= -0.5
+        residual += self._log_noise
+        return residual
+
+    def jac(self, log_tf_args):
+        """Evaluate the Jacobian of the residual vector.
+
+        Parameters
+        ----------
+        log_tf_args: array
+            A list of numerator and denominator coefficients, "logged".
+
+        Returns
+        -------
+        array
+            The Jacobian matrix with shape (len(f), len(log_tf_args)).
+
+        Notes
+        -----
+        With B and A the numerator and denominator evaluated at s,
+        d(residual)/d(log(b_i)) = -Re(b_i*s**(n-1-i)/B),
+        and d(residual)/d(log(a_i)) = Re(a_i*s**(n-1-i)/A).
+        """
+        tf_args = np.exp(log_tf_args)
+        n = int(len(tf_args)/2)
+        if len(self._s_vander) != n:
+            s = 1j*np.sqrt(self._w2)
+            # Rows are s**(n-1), ..., s**0.
+            self._s_vander = np.ascontiguousarray(np.vander(s, n).T)
+        num, den = np.reshape(tf_args, (2, n)) @ self._s_vander
+        jac = np.empty((len(tf_args), len(self._w2)))
+        jac[:n] = -(tf_args[:n, np.newaxis] * self._s_vander / num).real
+        jac[n:] = (tf_args[n:, np.newaxis] * self._s_vander / den).real
+        return jac.T
+
+
+class StallCallback:
+    """Differential evolution callback that stops a stalled search.
+
+    The search is stopped when the best cost hasn't improved by more than
+    ``rtol`` times itself in the last ``patience`` generations.
+
+    Parameters
+    ----------
+    rtol: float, optional
+        The relative improvement regarded as no improvement.
+        Defaults 1e-4.
+    patience: int, optional
+        The number of generations to wait for an improvement.
+        Defaults 10.
+    """
+    def __init__(self, rtol=1e-4, patience=10):
+        """Constructor
+
+        Parameters
+        ----------
+        rtol: float, optional
+            The relative improvement regarded as no improvement.
+            Defaults 1e-4.
+        patience: int, optional
+            The number of generations to wait for an improvement.
+            Defaults 10.
+        """
+        self.rtol = rtol
+        self.patience = patience
+        self.history = []
+
+    def __call__(self, intermediate_result):
+        """Record the best cost and decide whether to stop.
+
+        Parameters
+        ----------
+        intermediate_result: scipy.optimize.OptimizeResult
+            The best solution so far, passed by
+            scipy.optimize.differential_evolution().
+
+        Returns
+        -------
+        boolean
+            True to stop the search.
+        """
+        self.history.append(intermediate_result.fun)
+        if len(self.history) <= self.patience:
+            return False
+        improvement = self.history[-self.patience-1] - self.history[-1]
+        return improvement < self.rtol*abs(self.history[-1])
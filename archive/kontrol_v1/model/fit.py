@@ -1,5 +1,6 @@
 """Fitting tools for system models and noise.
 """
+from functools import lru_cache
 from scipy.optimize import minimize, differential_evolution
 from inspect import signature
 import numpy as np
@@ -18,7 +19,8 @@ def noise_fit(noise_model, f, noise_data, weight=None, x0=None, **kwargs):
         where a, b, c, \.\.\. are the parameters defining the noise models.
         Example models are in kontrol.model.noise.lvdt_noise() and
         kontrol.model.noise.geophone_noise(). The number of parameters will
-        be estimated by introspection (by the number of commas).
+        be estimated by introspection (by the number of parameters
+        without default values after f).
     f: array_like
         The frequency axis of the noise
     noise_data: array_like
@@ -47,7 +49,7 @@ def noise_fit(noise_model, f, noise_data, weight=None, x0=None, **kwargs):
     if weight is None:
         weight = np.ones_like(noise_data)
     if x0 is None:
-        no_of_params = str(signature(noise_model)).count(',')
+        no_of_params = _n_model_params(noise_model)
         x0 = np.ones(no_of_params)
     def cost(args):
         return(sum(np.sqrt((noise_model(f, *args)/noise_data
@@ -57,6 +59,30 @@ def noise_fit(noise_model, f, noise_data, weight=None, x0=None, **kwargs):
     args = res.x
     return args
 
+@lru_cache(maxsize=None)
+def _n_model_params(model):
+    """ Number of model parameters after the frequency argument.
+
+    Parameters
+    ----------
+    model: function
+        The model in the form of model(f, a, b, c, \.\.\.).
+
+    Returns
+    -------
+    int
+        The number of parameters without default values, excluding f.
+        Parameters with defaults, e.g. exp in lvdt_noise(),
+        are configuration and not fitted.
+    """
+    parameters = signature(model).parameters.values()
+    n_required = sum(
+        1 for parameter in parameters
+        if parameter.default is parameter.empty
+        and parameter.kind in (parameter.POSITIONAL_ONLY,
+                               parameter.POSITIONAL_OR_KEYWORD))
+    return n_required - 1
+
 def make_weight(x, *segments, default_weight=1.):
     """Make weighting functions for data fitting
 
@@ -145,7 +171,11 @@ def noise2zpk(f, noise_data, x0=None, bounds=None, max_order=20, weight=None):
         log_center = 10**log_center
         # x0 = np.ones(max_order*2) * log_center
         # x0 = np.ones(max_order*2) * min(f)
-        x0 = np.random.choice(np.logspace(np.log10(min(f)), np.log10(max(f)), len(f)), max_order*2)
+        # Draw from the log-spaced grid without building all of it.
+        log_f_min = np.log10(min(f))
+        log_f_step = (np.log10(max(f)) - log_f_min) / max(len(f)-1, 1)
+        i_grid = np.random.choice(len(f), max_order*2)
+        x0 = 10**(log_f_min + i_grid*log_f_step)
         x0 = np.append(x0, noise_data[0])
 #     print(len(x0))
     if bounds is None:
@@ -161,8 +191,10 @@ def noise2zpk(f, noise_data, x0=None, bounds=None, max_order=20, weight=None):
         'xtol':1e-7,
         'ftol':1e-8,
     }
-    res = minimize(_cost, x0=x0, args=(f, noise_data, weight), bounds=bounds, method='Powell', options={'disp':True, **options})
-    # res = differential_evolution(_cost, args=(f, noise_data, weight), bounds=bounds, disp=True, tol=1e-6, workers=-1, mutation=(0,1))
+    # The imaginary frequency axis is fixed throughout the optimization.
+    jf = 1j*np.asarray(f)
+    res = minimize(_cost, x0=x0, args=(jf, noise_data, weight), bounds=bounds, method='Powell', options={'disp':True, **options})
+    # res = differential_evolution(_cost, args=(jf, noise_data, weight), bounds=bounds, disp=True, tol=1e-6, workers=-1, mutation=(0,1))
 #     print(bounds)
 #     print(res.x)
     noise_zpk = _args2zpk(res.x)
@@ -187,9 +219,52 @@ def _args2zpk(args):
     gain = args[-1]
     return(zpk(zeros, poles, gain))
 
-def _cost(args, f, noise_data, weight):
-    zpk_fit = _args2zpk(args)
-    mag_fit = np.abs(zpk_fit.horner(2*np.pi*1j*f)[0][0])
+def _args2zpk_mag(f, args):
+    """ Magnitude response of the zpk transfer function from arguments.
+
+    Same as abs(_args2zpk(args).horner(2*np.pi*1j*f)[0][0]) but evaluated
+    directly with numpy, without building a transfer function.
+
+    Parameters
+    ----------
+    f: array
+        Frequency axis. In Hz.
+    args: list of floats
+        Length must be odd. The last number is gain. The first half of
+        the rest are zeros, and the second half are poles. In Hz.
+
+    Returns
+    -------
+    array
+        The magnitude response.
+    """
+    return _jf2zpk_mag(1j*np.asarray(f), args)
+
+def _jf2zpk_mag(jf, args):
+    """ _args2zpk_mag() with the precomputed imaginary frequency axis.
+
+    Parameters
+    ----------
+    jf: array
+        1j*f, i.e. s/(2*pi).
+    args: list of floats
+        Same as _args2zpk_mag().
+
+    Returns
+    -------
+    array
+        The magnitude response.
+    """
+    n = int(len(args)/2)
+    h = np.full(jf.shape, args[-1], dtype=complex)
+    for zero in args[0:n]:
+        h *= jf/zero + 1
+    for pole in args[n:len(args)-1]:
+        h /= jf/pole + 1
+    return np.abs(h)
+
+def _cost(args, jf, noise_data, weight):
+    mag_fit = _jf2zpk_mag(jf, args)
     residue = np.sum(((mag_fit-noise_data)  * weight)**2)
     return residue
 
@@ -219,18 +294,18 @@ def vinagre_weight(omega, normalize=True, log=True):
         Journal of Computational and Nonlinear Dynamics -
         J COMPUT NONLINEAR DYN. 3. 7-1077. 10.1115/1.2833906.
     """
-    weight=np.ones_like(omega)
-    for p in range(len(omega)):
-        if p == 0:
-            weight[p] = (omega[1]-omega[0])/(2*omega[0]**2)
-        elif p == len(omega)-1:
-            weight[p] = (omega[p]-omega[p-1])/(2*omega[p]**2)
-        else:
-            weight[p] = (omega[p+1]-omega[p-1])/(2*omega[p]**2)
+    omega = np.asarray(omega)
+    # Spacing around each point, one-sided at the two ends.
+    spacing = np.empty_like(omega)
+    spacing[0] = omega[1] - omega[0]
+    spacing[-1] = omega[-1] - omega[-2]
+    spacing[1:-1] = omega[2:] - omega[:-2]
+    weight = spacing / (2*omega**2)
     if log:
-        weight = np.log10(weight) - min(np.log10(weight))
+        weight = np.log10(weight)
+        weight -= np.min(weight)
     if normalize:
-        weight /= max(weight)
+        weight /= np.max(weight)
     return weight
 
 
@@ -277,5 +352,5 @@ def one_on_f_weight(f, normalize=True):
     """
     weight = 1/f
     if normalize:
-        weight /= max(weight)
+        weight /= np.max(weight)
     return(weight)
@@ -0,0 +1,43 @@
+"""Test for the ZPK fit of complementary filter synthesis
+"""
+import numpy as np
+
+import kontrol.core.complementary_filter.complementary_filter as cf
+import kontrol.core.complementary_filter.conversion as conversion
+
+
+def test_delta_args2zpk_args():
+    delta_args = np.array([0, 0.75, 1, 1, 1, 1, 2.])
+    zpk_args = conversion.delta_args2zpk_args(
+        delta_args=delta_args, f_min=0.01, f_max=100)
+    assert np.allclose(zpk_args, [0.01, 1, 100, 100, 100, 100, 2])
+
+
+def test_delta_args2zpk_args_per_decade():
+    rng = np.random.default_rng(123)
+    delta_args = rng.uniform(size=(7, 100000))
+    zpk_args = conversion.delta_args2zpk_args(
+        delta_args=delta_args, f_min=0.01, f_max=100)
+    roots = zpk_args[:-1]
+    assert np.all(np.diff(roots[:3], axis=0) >= 0)
+    assert np.all(np.diff(roots[3:6], axis=0) >= 0)
+    # Uniform spacings give an even share of zeros and poles per decade.
+    count, _ = np.histogram(np.log10(roots), bins=4, range=(-2, 2))
+    assert np.allclose(count/roots.size, 0.25, atol=0.01)
+
+
+def test_zpk_fit_within_f():
+    f = np.logspace(-2, 2, 200)
+    # Zeros and poles above max(f) pull the search out of band
+    # if the log-spacings aren't bounded cumulatively.
+    noise_asd = conversion.args2zpk(
+        f=f, zpk_args=[30, 200, 500, 0.1, 300, 1000, 1], return_mag=True)
+    comp = cf.ComplementaryFilter(f=f, noise1=noise_asd, noise2=noise_asd)
+    res = comp.zpk_fit(
+        f=f, noise_asd=noise_asd, order=3,
+        differential_evolution_kwargs={"seed": 123})
+    roots = res.zpk_args[:-1]
+    assert np.all(roots >= min(f)*(1-1e-12))
+    assert np.all(roots <= max(f)*(1+1e-12))
+    assert np.all(np.diff(roots[:3]) >= 0)
+    assert np.all(np.diff(roots[3:]) >= 0)
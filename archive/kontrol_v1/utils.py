@@ -21,11 +21,10 @@ def quad_sum(*spectra):
             The quadrature sum of the spectra.
 
     """
-    qs=np.zeros_like(spectra[0])
-#     print(args[0])
-    for i in spectra:
-        for j in range(len(i)):
-            qs[j]=np.sqrt(qs[j]**2+i[j]**2)
+    qs=np.zeros_like(spectra[0], dtype=float)
+    for spectrum in spectra:
+        qs+=np.square(spectrum)
+    np.sqrt(qs, out=qs)
     return qs
 
 
@@ -211,29 +210,21 @@ def zpk(zeros, poles, gain, unit='Hz', negate=True):
         The zero and poles are negated by default.
     """
 
-    zeros = [float(z) for z in zeros]
-    poles = [float(p) for p in poles]
-
-    zeros = np.array(zeros)
-    poles = np.array(poles)
+    zeros = np.array(zeros, dtype=float)
+    poles = np.array(poles, dtype=float)
 
     if unit == 'Hz':
-        for i in range(len(zeros)):
-            zeros[i] = 2*np.pi*zeros[i]
-        for i in range(len(poles)):
-            poles[i] = 2*np.pi*poles[i]
+        zeros *= 2*np.pi
+        poles *= 2*np.pi
 
     if negate is False:
-        for i in range(len(zeros)):
-            zeros[i] = -zeros[i]
-        for i in range(len(poles)):
-            poles[i] = -poles[i]
+        zeros = -zeros
+        poles = -poles
 
-    zpk_tf = tf([gain],[1])
-    for z in zeros:
-        zpk_tf *= tf([1/z, 1], [1])
-    for p in poles:
-        zpk_tf *= tf([1], [1/p, 1])
+    # prod(s/z+1) = poly(-z)/prod(z), normalized with one np.prod each.
+    num = gain * np.atleast_1d(np.poly(-zeros)) / np.prod(zeros)
+    den = np.atleast_1d(np.poly(-poles)) / np.prod(poles)
+    zpk_tf = tf(num, den)
 
     return zpk_tf
 
@@ -282,14 +273,14 @@ def convert_unstable_tf(control_tf):
     s = control.tf("s")
     for zero in zeros_stable:
         if zero.imag != 0:
-            wn = np.sqrt(zero.real**2 + zero.imag**2)
+            wn = abs(zero)
             zeta = -zero.real/wn
             tf_new /= wn**2 / (s**2+2*zeta*wn*s+wn**2)
         else:
             tf_new *= s-zero.real
     for pole in poles_stable:
         if pole.imag != 0:
-            wn = np.sqrt(pole.real**2 + pole.imag**2)
+            wn = abs(pole)
             zeta = -pole.real/wn
             tf_new *= wn**2 / (s**2+2*zeta*wn*s+wn**2)
         else:
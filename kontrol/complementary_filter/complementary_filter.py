@@ -1,14 +1,22 @@
 """Complementary filter class for sythesis
 """
+import importlib
+
 import numpy as np
 
 
-import kontrol.core.math
 import kontrol.core.controlutils
 import kontrol.complementary_filter.synthesis
 import kontrol.transfer_function
 
 
+# for ad hoc/optional packages
+joblib_spec = importlib.util.find_spec("joblib")
+joblib_exist = joblib_spec is not None
+if joblib_exist:
+    import joblib
+
+
 class ComplementaryFilter():
     r"""Complementary filter synthesis class.
 
@@ -70,6 +78,9 @@ class ComplementaryFilter():
         Ground-Based Gravitational-Wave Detectors.
         https://arxiv.org/pdf/2111.14355.pdf
     """
+    __slots__ = ("_noise1", "_noise2", "_weight1", "_weight2",
+                 "_filter1", "_filter2", "_f")
+
     def __init__(self, noise1=None, noise2=None, weight1=None, weight2=None,
                  filter1=None, filter2=None, f=None):
         """Constructor
@@ -183,6 +194,71 @@ class ComplementaryFilter():
             self.filter2 = 1 - self.filter1
         return self.filter1, self.filter2
 
+    def _synthesis_batch(self, func, weight1_list, weight2_list,
+                         clean_filter=True, n_jobs=-1, **kwargs):
+        """Complementary filter synthesis over a list of weighting functions.
+
+        Each pair of weights is an independent synthesis problem,
+        so they are solved concurrently with ``joblib`` if it is installed.
+        Otherwise, they are solved one after another.
+        The noise models are taken from ``self.noise1`` and ``self.noise2``
+        and the attributes of this object are not modified.
+
+        Parameters
+        ----------
+        func: function
+            The function that takes two noise models and two weighting
+            functions and returns a pair of complementary filters.
+            It should have a signature of
+            func(noise1, noise2, weight1, weight2, **kwargs) ->
+            (TransferFunction, TransferFunction).
+        weight1_list : list of TransferFunction
+            List of weighting functions for noise 1.
+        weight2_list : list of TransferFunction
+            List of weighting functions for noise 2.
+            Must have the same length as ``weight1_list``.
+        clean_filter : boolean, optional
+            Remove small outlier coefficients from filters.
+            Defaults True.
+        n_jobs : int, optional
+            Number of jobs passed to ``joblib.Parallel``.
+            Ignored if ``joblib`` is not installed.
+            Defaults -1.
+        **kwargs
+            Keyword arguments passed to ``func`` and
+            kontrol.TransferFunction.clean().
+
+        Returns
+        -------
+        list of (TransferFunction, TransferFunction)
+            The complementary filters synthesized with each pair of weights.
+        """
+        if len(weight1_list) != len(weight2_list):
+            raise ValueError("Length of weight1_list must match length of "
+                             "weight2_list.")
+        noise1 = self.noise1
+        noise2 = self.noise2
+        if joblib_exist:
+            filters = joblib.Parallel(n_jobs=n_jobs)(
+                joblib.delayed(func)(
+                    noise1, noise2, weight1, weight2, **kwargs)
+                for weight1, weight2 in zip(weight1_list, weight2_list))
+        else:
+            filters = [
+                func(noise1, noise2, weight1, weight2, **kwargs)
+                for weight1, weight2 in zip(weight1_list, weight2_list)]
+
+        filter_pairs = []
+        for filter1, filter2 in filters:
+            filter1 = kontrol.transfer_function.TransferFunction(filter1)
+            filter2 = kontrol.transfer_function.TransferFunction(filter2)
+            if clean_filter:
+                filter1.clean(**kwargs)
+                filter2 = kontrol.transfer_function.TransferFunction(
+                    1 - filter1)
+            filter_pairs.append((filter1, filter2))
+        return filter_pairs
+
     @property
     def noise1(self):
         """Transfer function model of sensor noise 1.
@@ -215,6 +291,38 @@ class ComplementaryFilter():
         """
         self._noise2 = _noise2
 
+    @property
+    def weight1(self):
+        """Weighting function for noise 1.
+        """
+        return self._weight1
+
+    @weight1.setter
+    def weight1(self, _weight1):
+        """weight1 setter
+
+        Parameters
+        ----------
+        _weight1 : TransferFunction
+        """
+        self._weight1 = _weight1
+
+    @property
+    def weight2(self):
+        """Weighting function for noise 2.
+        """
+        return self._weight2
+
+    @weight2.setter
+    def weight2(self, _weight2):
+        """weight2 setter
+
+        Parameters
+        ----------
+        _weight2 : TransferFunction
+        """
+        self._weight2 = _weight2
+
     def noise_super(self, f=None, noise1=None, noise2=None,
                     filter1=None, filter2=None):
         """Compute and return predicted the ASD of the super sensor noise
@@ -261,19 +369,35 @@ class ComplementaryFilter():
                 raise ValueError("self.filter2 is not specified. "
                                  "Please specify self.filter2 or synthesize.")
             filter2 = self.filter2
+        # Work with squared magnitudes and take a single square root at the
+        # end, instead of abs() on every response followed by quad_sum().
+        s = 1j*2*np.pi*f
         if noise1 is None:
             if self.noise1 is None:
                 raise ValueError("noise1 is not specified. "
                                  "Please specify noise1 or self.noise1.")
-            noise1 = abs(self.noise1(1j*2*np.pi*f))
+            noise1_response = self.noise1(s)
+            noise1_mag2 = (noise1_response.real*noise1_response.real
+                           + noise1_response.imag*noise1_response.imag)
+        else:
+            noise1_mag2 = np.square(noise1)
         if noise2 is None:
             if self.noise2 is None:
                 raise ValueError("noise2 is not specified. "
                                  "Please specify noise2 or self.noise2.")
-            noise2 = abs(self.noise2(1j*2*np.pi*f))
-        noise1_filtered = abs(filter1(1j*2*np.pi*f)) * noise1
-        noise2_filtered = abs(filter2(1j*2*np.pi*f)) * noise2
-        return kontrol.core.math.quad_sum(noise1_filtered, noise2_filtered)
+            noise2_response = self.noise2(s)
+            noise2_mag2 = (noise2_response.real*noise2_response.real
+                           + noise2_response.imag*noise2_response.imag)
+        else:
+            noise2_mag2 = np.square(noise2)
+        filter1_response = filter1(s)
+        filter2_response = filter2(s)
+        noise_super_mag2 = (
+            (filter1_response.real*filter1_response.real
+             + filter1_response.imag*filter1_response.imag) * noise1_mag2
+            + (filter2_response.real*filter2_response.real
+               + filter2_response.imag*filter2_response.imag) * noise2_mag2)
+        return np.sqrt(noise_super_mag2)
 
     @property
     def filter1(self):
@@ -2,6 +2,11 @@
 """
 import control
 import numpy as np
+import scipy.signal
+
+
+# The Laplace variable, shared so it's not parsed on every call.
+_S = control.tf("s")
 
 
 def tfmatrix2tf(sys):
@@ -18,14 +23,8 @@ def tfmatrix2tf(sys):
     control.xferfcn.TransferFunction
         The transfer function of the MIMO system.
     """
-    nums = list(np.zeros_like(sys))
-    dens = list(np.zeros_like(sys))
-    for i in range(len(sys)):
-        for j in range(len(sys[i])):
-            nums[i][j] = list(sys[i][j].num[0][0])
-            dens[i][j] = list(sys[i][j].den[0][0])
-        nums[i] = list(nums[i])
-        dens[i] = list(dens[i])
+    nums = [[tf.num[0][0] for tf in row] for row in sys]
+    dens = [[tf.den[0][0] for tf in row] for row in sys]
     generalized_plant = control.tf(nums, dens)
     return generalized_plant
 
@@ -63,29 +62,22 @@ def zpk(zeros, poles, gain, unit='f', negate=True):
     The zero and poles are negated by default.
     """
 
-    zeros = [float(z) for z in zeros]
-    poles = [float(p) for p in poles]
-
-    zeros = np.array(zeros)
-    poles = np.array(poles)
+    zeros = np.array(zeros, dtype=float)
+    poles = np.array(poles, dtype=float)
 
     if unit in ["f", "Hz"]:
-        for i in range(len(zeros)):
-            zeros[i] = 2*np.pi*zeros[i]
-        for i in range(len(poles)):
-            poles[i] = 2*np.pi*poles[i]
+        zeros = 2*np.pi*zeros
+        poles = 2*np.pi*poles
 
     if negate is False:
-        for i in range(len(zeros)):
-            zeros[i] = -zeros[i]
-        for i in range(len(poles)):
-            poles[i] = -poles[i]
+        zeros = -zeros
+        poles = -poles
 
-    zpk_tf = control.tf([gain], [1])
-    for z in zeros:
-        zpk_tf *= control.tf([1/z, 1], [1])
-    for p in poles:
-        zpk_tf *= control.tf([1], [1/p, 1])
+    # s/z+1 = (s+z)/z, so the polynomials are built from the roots
+    # in one go instead of multiplying transfer functions one by one.
+    num = gain * _poly(-zeros) / np.prod(zeros)
+    den = _poly(-poles) / np.prod(poles)
+    zpk_tf = control.tf(num, den)
 
     return zpk_tf
 
@@ -131,13 +123,59 @@ def sos(natural_frequencies=None, quality_factors=None, gain=1., unit="f"):
     if unit in ["f", "Hz"]:
         natural_frequencies = 2*np.pi*natural_frequencies
 
-    s = control.tf("s")
-    sos = control.tf([gain], [1])
-    for wn, q in zip(natural_frequencies, quality_factors):
-        sos *= (s**2 + wn/q*s + wn**2)/wn**2
+    wn = natural_frequencies
+    q = quality_factors
+    roots = _sos_roots(wn=wn, q=q)
+    num = gain * _poly(roots).real / np.prod(wn**2)
+    sos = control.tf(num, [1])
     return sos
 
 
+def _poly(roots):
+    """Polynomial coefficients from roots.
+
+    Parameters
+    ----------
+    roots: array
+        The roots.
+
+    Returns
+    -------
+    array
+        The coefficients of the monic polynomial,
+        from higher order to lower order, like np.poly().
+        It's [1.] if there's no root.
+
+    Note
+    ----
+    np.polynomial.polynomial.polyfromroots() multiplies the factors
+    pairwise in a divide-and-conquer manner,
+    instead of one root at a time like np.poly().
+    """
+    return np.polynomial.polynomial.polyfromroots(roots)[::-1]
+
+
+def _sos_roots(wn, q):
+    """Roots of second-order sections.
+
+    Parameters
+    ----------
+    wn: array
+        Natural frequencies in rad/s.
+    q: array
+        Quality factors.
+
+    Returns
+    -------
+    array
+        The roots of all s**2 + wn/q*s + wn**2,
+        the ones with positive imaginary part first.
+    """
+    # The square root is complex so overdamped sections give real roots.
+    damped = wn * np.sqrt(1 - 1/(4*q**2) + 0j)
+    return np.concatenate((-wn/(2*q) + 1j*damped, -wn/(2*q) - 1j*damped))
+
+
 def convert_unstable_tf(control_tf):
     """Convert transfer function with unstable zeros and poles to tf without.
 
@@ -157,45 +195,11 @@ def convert_unstable_tf(control_tf):
     This happens due to numerical accuracy,
     i.e. coefficients get astronomically high when order gets high.
     """
-    zeros_unstable = control_tf.zeros()
-    poles_unstable = control_tf.poles()
-    zeros_stable = []
-    poles_stable = []
-    for zero in zeros_unstable:
-        # Ignore zeros/poles that have negative imaginary part.
-        if zero.imag != 0 and zero.imag < 0:
-            pass
-        elif zero.real > 0:
-            zeros_stable.append(-zero.real + 1j*zero.imag)
-        else:
-            zeros_stable.append(zero.real + 1j*zero.imag)
-    for pole in poles_unstable:
-        # Ignore zeros/poles that have negative imaginary part.
-        if pole.imag != 0 and pole.imag < 0:
-            pass
-        elif pole.real > 0:
-            poles_stable.append(-pole.real + 1j*pole.imag)
-        else:
-            poles_stable.append(pole.real + 1j*pole.imag)
-
-    tf_new = control.tf([1], [1])
-    s = control.tf("s")
-    for zero in zeros_stable:
-        if zero.imag != 0:
-            wn = np.sqrt(zero.real**2 + zero.imag**2)
-            zeta = -zero.real/wn
-            tf_new /= wn**2 / (s**2+2*zeta*wn*s+wn**2)
-        else:
-            tf_new *= s-zero.real
-    for pole in poles_stable:
-        if pole.imag != 0:
-            wn = np.sqrt(pole.real**2 + pole.imag**2)
-            zeta = -pole.real/wn
-            tf_new *= wn**2 / (s**2+2*zeta*wn*s+wn**2)
-        else:
-            tf_new /= s-pole.real
+    num = _stable_poly(control_tf.zeros())
+    den = _stable_poly(control_tf.poles())
+    tf_new = control.tf(num, den)
 
-    tf_new *= float(control_tf.dcgain())/float(tf_new.dcgain())
+    tf_new *= _dcgain(control_tf) / _dcgain(tf_new)
 
     return tf_new
 
@@ -220,14 +224,83 @@ def check_tf_equal(tf1, tf2, allclose_kwargs={}, minreal=True):
     Returns
     -------
     boolean
+
+    Note
+    ----
+    Zeros and poles are sorted before comparison.
+    control.minreal is only used if the transfer functions
+    are not equal as they are.
     """
+    if _tf_close(tf1, tf2, allclose_kwargs=allclose_kwargs):
+        return True
     if minreal:
         tf1 = control.minreal(tf1, verbose=False)
         tf2 = control.minreal(tf2, verbose=False)
-    zeros_close = np.allclose(tf1.zeros(), tf2.zeros(), **allclose_kwargs)
-    poles_close = np.allclose(tf1.poles(), tf2.poles(), **allclose_kwargs)
-    gain_close = np.allclose(tf1.dcgain(), tf2.dcgain(), **allclose_kwargs)
-    return all([zeros_close, poles_close, gain_close])
+        return _tf_close(tf1, tf2, allclose_kwargs=allclose_kwargs)
+    return False
+
+
+def _tf_close(tf1, tf2, allclose_kwargs={}):
+    """Compare matched zeros, poles, and DC gains of two transfer functions.
+
+    Parameters
+    ----------
+    tf1: control.xferfcn.TransferFunction
+        Transfer function 1.
+    tf2: control.xferfcn.TrasnferFunction
+        Transfer function 2.
+    allclose_kwargs: dict, optional
+        Keyword arguments passed to np.allclose().
+        Defaults {}.
+
+    Returns
+    -------
+    boolean
+    """
+    zeros_close = _roots_close(
+        tf1.zeros(), tf2.zeros(), allclose_kwargs=allclose_kwargs)
+    if not zeros_close:
+        return False
+    poles_close = _roots_close(
+        tf1.poles(), tf2.poles(), allclose_kwargs=allclose_kwargs)
+    if not poles_close:
+        return False
+    return np.allclose(tf1.dcgain(), tf2.dcgain(), **allclose_kwargs)
+
+
+def _roots_close(roots1, roots2, allclose_kwargs={}):
+    """Match two sets of roots pairwise within tolerance.
+
+    Each root in ``roots1`` is paired with the nearest unmatched root
+    in ``roots2`` that is close to it.
+    Unlike sorting, this does not depend on the ordering of roots
+    with (nearly) equal real parts.
+
+    Parameters
+    ----------
+    roots1: array
+        Roots 1.
+    roots2: array
+        Roots 2.
+    allclose_kwargs: dict, optional
+        Keyword arguments passed to np.isclose().
+        Defaults {}.
+
+    Returns
+    -------
+    boolean
+    """
+    if len(roots1) != len(roots2):
+        return False
+    unmatched = list(roots2)
+    for root in roots1:
+        close = np.isclose(root, unmatched, **allclose_kwargs)
+        if not np.any(close):
+            return False
+        distance = np.where(
+            close, np.abs(np.subtract(unmatched, root)), np.inf)
+        unmatched.pop(int(np.argmin(distance)))
+    return True
 
 
 def generic_tf(zeros=None, poles=None,
@@ -284,16 +357,26 @@ def generic_tf(zeros=None, poles=None,
     if poles_q is None:
         poles_q = []
 
-    zeros = np.array(zeros)
-    poles = np.array(poles)
-    zeros_wn = np.array(zeros_wn)
-    zeros_q = np.array(zeros_q)
-    poles_wn = np.array(poles_wn)
-    poles_q = np.array(poles_q)
+    zeros = np.array(zeros, dtype=float)
+    poles = np.array(poles, dtype=float)
+    zeros_wn = np.array(zeros_wn, dtype=float)
+    zeros_q = np.array(zeros_q, dtype=float)
+    poles_wn = np.array(poles_wn, dtype=float)
+    poles_q = np.array(poles_q, dtype=float)
 
-    tf = zpk(zeros=zeros, poles=poles, gain=dcgain, unit=unit)
-    tf *= sos(natural_frequencies=zeros_wn, quality_factors=zeros_q, unit=unit)
-    tf /= sos(natural_frequencies=poles_wn, quality_factors=poles_q, unit=unit)
+    if unit in ["f", "Hz"]:
+        zeros = 2*np.pi*zeros
+        poles = 2*np.pi*poles
+        zeros_wn = 2*np.pi*zeros_wn
+        poles_wn = 2*np.pi*poles_wn
+
+    # All roots in the s-plane, expanded once by scipy.signal.zpk2tf.
+    z = np.concatenate((-zeros, _sos_roots(wn=zeros_wn, q=zeros_q)))
+    p = np.concatenate((-poles, _sos_roots(wn=poles_wn, q=poles_q)))
+    # Every factor (s-r)/(-r) has unity DC gain.
+    k = dcgain * np.prod(-p).real / np.prod(-z).real
+    num, den = scipy.signal.zpk2tf(z, p, k)
+    tf = control.tf(np.atleast_1d(num), np.atleast_1d(den))
     return tf
 
 
@@ -324,27 +407,48 @@ def outliers(tf, f, unit="f"):
     the returned zeros and poles, so to preserve the type and format
     as much as possible for further processes.
     """
-    outlier_zeros = []
-    outlier_poles = []
     zeros = tf.zeros()
     poles = tf.poles()
+    mask_zeros, mask_poles = _outlier_masks(
+        zeros=zeros, poles=poles, f=f, unit=unit)
+    outlier_zeros = zeros[mask_zeros]
+    outlier_poles = poles[mask_poles]
+    return outlier_zeros, outlier_poles
+
+
+def _outlier_masks(zeros, poles, f, unit="f"):
+    """Returns masks of zeros and poles outside the frequency range.
+
+    Parameters
+    ----------
+    zeros: array
+        The zeros.
+    poles: array
+        The poles.
+    f: array
+        The frequency axis of interest.
+    unit: str, optional
+        The unit of the zeros, poles and the natural frequencies.
+        Choose from ["f", "s", "Hz", "omega"].
+        Defaults "f".
+
+    Returns
+    -------
+    mask_zeros: array of boolean
+        True for zeros outside the frequency range.
+    mask_poles: array of boolean
+        True for poles outside the frequency range.
+    """
     f = np.array(f)
     if unit in ["f", "Hz"]:
         f = f*2*np.pi
-    f_min = min(f)
-    f_max = max(f)
-
-    for zero in zeros:
-        fn = np.sqrt(zero.real**2 + zero.imag**2)
-        if fn < f_min or fn > f_max:
-            outlier_zeros.append(zero)
-    for pole in poles:
-        fn = np.sqrt(pole.real**2 + pole.imag**2)
-        if fn < f_min or fn > f_max:
-            outlier_poles.append(pole)
-    outlier_zeros = np.array(outlier_zeros)
-    outlier_poles = np.array(outlier_poles)
-    return outlier_zeros, outlier_poles
+    f_min = np.min(f)
+    f_max = np.max(f)
+    wn_zeros = np.sqrt(zeros.real**2 + zeros.imag**2)
+    wn_poles = np.sqrt(poles.real**2 + poles.imag**2)
+    mask_zeros = (wn_zeros < f_min) | (wn_zeros > f_max)
+    mask_poles = (wn_poles < f_min) | (wn_poles > f_max)
+    return mask_zeros, mask_poles
 
 
 def outlier_exists(tf, f, unit="f"):
@@ -366,11 +470,9 @@ def outlier_exists(tf, f, unit="f"):
     boolean
         If there's any zero or pole outside the frequency range.
     """
-    outlier_zeros, outlier_poles = outliers(tf=tf, f=f, unit=unit)
-    if len(outlier_zeros) + len(outlier_poles) > 0:
-        return True
-    else:
-        return False
+    mask_zeros, mask_poles = _outlier_masks(
+        zeros=tf.zeros(), poles=tf.poles(), f=f, unit=unit)
+    return bool(mask_zeros.any() or mask_poles.any())
 
 
 def tf_order_split(tf, max_order=20):
@@ -391,126 +493,16 @@ def tf_order_split(tf, max_order=20):
     """
     zeros = tf.zeros()
     poles = tf.poles()
-    gain = tf.minreal().num[0][0][0]
+    # The leading coefficient ratio, which is what minreal() leaves in
+    # front of the monic polynomials, without finding the roots again.
+    gain = tf.num[0][0][0] / tf.den[0][0][0]
 
-    global order_running
-    global zero_running
-    global tf_zero_list
-    global pole_running
-    global tf_pole_list
-    order_running = 0
-    zero_running = []
-    tf_zero_list = []
-    pole_running = []
-    tf_pole_list = []
-
-    def put_tf_zeros_into_list():
-        """Use zeros in zero_running to create an all zero transfer function
-        and put store them into tf_zero_list, and reset order_running to 0.
-        """
-        s = control.tf("s")
-        global order_running
-        global zero_running
-        global tf_zero_list
-        simple_zeros = []
-        zeros_wn = []
-        zeros_q = []
-        differentiator = 0
-        gain = 1
-        for z in zero_running:
-            if z.imag == 0:
-                if z.real == 0:
-                    differentiator += 1
-                    # gain *= 2*np.pi
-                else:
-                    gain *= -z.real
-                    simple_zeros += [-z.real]
-            else:
-                wn = abs(z)
-                q = wn / (-2*z.real)
-                gain *= wn**2
-                zeros_wn += [abs(z)]
-                zeros_q += [q]
-        tf = generic_tf(zeros=simple_zeros,
-                        zeros_wn=zeros_wn, zeros_q=zeros_q,
-                        dcgain=gain, unit="s")
-        for i in range(differentiator):
-            tf *= s
-        tf_zero_list += [tf]
-        order_running = 0
-        zero_running = []
-
-    def put_tf_poles_into_list():
-        """Use poles in pole_running to create an all pole transfer function
-        and put store them into tf_pole_list, and reset order_running to 0.
-        """
-        s = control.tf("s")
-        global order_running
-        global pole_running
-        global tf_pole_list
-        simple_poles = []
-        poles_wn = []
-        poles_q = []
-        integrator = 0
-        gain = 1
-        for p in pole_running:
-            if p.imag == 0:
-                if p.real == 0:
-                    integrator += 1
-                    # gain /= 2*np.pi
-                else:
-                    gain /= -p.real
-                    simple_poles += [-p.real]
-            else:
-                wn = abs(p)
-                q = wn / (-2*p.real)
-                gain /= wn**2
-                poles_wn += [abs(p)]
-                poles_q += [q]
-        tf = generic_tf(poles=simple_poles,
-                        poles_wn=poles_wn, poles_q=poles_q,
-                        dcgain=gain, unit="s")
-        for _ in range(integrator):
-            tf *= 1/s
-        tf_pole_list += [tf]
-        order_running = 0
-        pole_running = []
-
-    # Put zeros into list until order reaches max_order.
-    # And then make a transfer function out of the list,
-    # and finally resets.
-    for i in range(len(zeros)):
-        if zeros[i].imag == 0:
-            if order_running+1 > max_order:
-                put_tf_zeros_into_list()
-            order_running += 1
-            zero_running += [zeros[i]]
-        elif zeros[i].imag > 0:
-            if order_running+2 > max_order:
-                put_tf_zeros_into_list()
-            order_running += 2
-            zero_running += [zeros[i]]
-        else:
-            pass  # Ignore negative part of the complex pair.
-
-    # Add the reminders
-    put_tf_zeros_into_list()
-
-    for i in range(len(poles)):
-        if poles[i].imag == 0:
-            if order_running+1 > max_order:
-                put_tf_poles_into_list()
-            order_running += 1
-            pole_running += [poles[i]]
-        elif poles[i].imag > 0:
-            if order_running + 2 > max_order:
-                put_tf_poles_into_list()
-            order_running += 2
-            pole_running += [poles[i]]
-        else:
-            pass  # Ignore negative part of the complex pair.
-
-    put_tf_poles_into_list()
+    tf_zero_list = [
+        _roots2tf(roots=zeros_chunk, pole=False)
+        for zeros_chunk in _split_roots(roots=zeros, max_order=max_order)]
+    tf_pole_list = [
+        _roots2tf(roots=poles_chunk, pole=True)
+        for poles_chunk in _split_roots(roots=poles, max_order=max_order)]
 
     n_tf = max(len(tf_pole_list), len(tf_zero_list))
     tf_list = []
@@ -526,6 +518,77 @@ def tf_order_split(tf, max_order=20):
     return tf_list
 
 
+def _split_roots(roots, max_order):
+    """Split zeros or poles into groups that have limited order.
+
+    Parameters
+    ----------
+    roots: array
+        The zeros or poles.
+    max_order: int
+        The maximum order of each group.
+
+    Returns
+    -------
+    list of array
+        The groups of zeros or poles.
+        Complex roots with negative imaginary part are dropped
+        as they are represented by their conjugates.
+        There is always at least one group, which can be empty.
+    """
+    roots = roots[roots.imag >= 0]
+    orders = np.where(roots.imag == 0, 1, 2)
+    groups = []
+    start = 0
+    order_running = 0
+    for i, order in enumerate(orders):
+        if order_running+order > max_order:
+            groups.append(roots[start:i])
+            start = i
+            order_running = 0
+        order_running += order
+    groups.append(roots[start:])
+    return groups
+
+
+def _roots2tf(roots, pole=False):
+    """Make an all-zero or all-pole transfer function with unity leading gain
+
+    Parameters
+    ----------
+    roots: array
+        The zeros or poles.
+        Complex roots with negative imaginary part are not included.
+    pole: boolean, optional
+        The roots are poles.
+        Defaults False.
+
+    Returns
+    -------
+    TransferFunction
+        The all-zero transfer function, or all-pole if pole is True.
+    """
+    s = _S
+    real_roots = roots[roots.imag == 0].real
+    n_origin = np.count_nonzero(real_roots == 0)
+    simple_roots = -real_roots[real_roots != 0]
+    complex_roots = roots[roots.imag != 0]
+    wn = abs(complex_roots)
+    q = wn / (-2*complex_roots.real)
+    gain = np.prod(simple_roots) * np.prod(wn**2)
+    if pole:
+        tf = generic_tf(poles=simple_roots, poles_wn=wn, poles_q=q,
+                        dcgain=1/gain, unit="s")
+        for _ in range(n_origin):
+            tf *= 1/s
+    else:
+        tf = generic_tf(zeros=simple_roots, zeros_wn=wn, zeros_q=q,
+                        dcgain=gain, unit="s")
+        for _ in range(n_origin):
+            tf *= s
+    return tf
+
+
 def clean_tf(tf, tol_order=5, small_number=1e-25):
     """Remove numerator/denominator coefficients that are small outliers
 
@@ -547,12 +610,14 @@ def clean_tf(tf, tol_order=5, small_number=1e-25):
     """
     num = tf.num[0][0].copy()
     den = tf.den[0][0].copy()
-    log_num = np.log10(num+small_number)
-    log_den = np.log10(den+small_number)
+    log_num = np.add(num, small_number)
+    log_den = np.add(den, small_number)
+    np.log10(log_num, out=log_num)
+    np.log10(log_den, out=log_den)
     num_mask = log_num.mean() - log_num > tol_order
     den_mask = log_den.mean() - log_den > tol_order
-    num[num_mask] = 0
-    den[den_mask] = 0
+    np.putmask(num, num_mask, 0)
+    np.putmask(den, den_mask, 0)
     tf_cleaned = control.tf(num, den)
     # tf_cleaned = tf_cleaned.minreal()
     return tf_cleaned
@@ -577,8 +642,8 @@ def clean_tf2(tf, tol_order=5, small_number=1e-25):
     tf_cleaned : TransferFunction
         The cleaned transfer function.
     """
-    zeros = tf.zeros().copy()
-    poles = tf.poles().copy()
+    zeros = tf.zeros()
+    poles = tf.poles()
     wn_zeros = abs(zeros)
     wn_poles = abs(poles)
     log_wn_zeros = np.log10(wn_zeros+small_number)
@@ -587,50 +652,61 @@ def clean_tf2(tf, tol_order=5, small_number=1e-25):
     mean_wn_poles = np.mean(log_wn_poles)
     mask_zeros = abs(log_wn_zeros-mean_wn_zeros) > tol_order
     mask_poles = abs(log_wn_poles-mean_wn_poles) > tol_order
-    zeros[mask_zeros] = None
-    poles[mask_poles] = None
-
-    s = control.tf("s")
-    tf_cleaned = control.tf([1], [1])
-    for i, zero in enumerate(zeros):
-        if mask_zeros[i]:  # Remove outliers
-            continue
-        if zero.imag < 0:  # Only treat positive imag part.
-            continue
-        elif zero.imag != 0 and zero.real != 0:
-            wn, q = complex2wq(zero)
-            tf_cleaned *= (s**2 + wn/q*s + wn**2) / wn**2
-        elif zero.real == 0 and zero.imag != 0:
-            wn = abs(zero)
-            tf_cleaned *= (s**2 + wn**2) / wn**2
-        elif zero.real != 0 and zero.imag == 0:
-            tf_cleaned *= (s+abs(zero))/abs(zero)
-        elif zero == 0:
-            tf_cleaned *= s
-
-    for i, pole in enumerate(poles):
-        if mask_poles[i]:  # Remove outliers
-            continue
-        if pole.imag < 0:  # Only treat positive imag part.
-            continue
-        elif pole.imag != 0 and pole.real != 0:
-            wn, q = complex2wq(pole)
-            tf_cleaned /= (s**2 + wn/q*s + wn**2) / wn**2
-        elif pole.real == 0 and pole.imag != 0:
-            wn = abs(pole)
-            tf_cleaned /= (s**2 + wn**2) / wn**2
-        elif pole.real != 0 and pole.imag == 0:
-            tf_cleaned /= (s+abs(pole))/abs(pole)
-        elif pole == 0:
-            tf_cleaned /= s
+    # Remove outliers.
+    zeros = zeros[~mask_zeros]
+    poles = poles[~mask_poles]
+
+    num = _stable_poly(zeros)
+    den = _stable_poly(poles)
+    tf_cleaned = control.tf(num, den)
 
     # Match gain at 1 Hz
-    gain_1hz = abs(tf(1j*2*np.pi*1))
-    tf_cleaned *= gain_1hz / abs(tf_cleaned(1j*2*np.pi*1))
+    gain_1hz = abs(_tfval(tf, 1j*2*np.pi*1))
+    tf_cleaned *= gain_1hz / abs(_tfval(tf_cleaned, 1j*2*np.pi*1))
     # tf_cleaned = tf_cleaned.minreal()
     return tf_cleaned
 
 
+def _stable_poly(roots):
+    """Polynomial with roots mirrored to the left half plane.
+
+    Parameters
+    ----------
+    roots : array
+        The zeros or poles.
+        Roots with negative imaginary part are ignored and their
+        conjugates are used instead.
+
+    Returns
+    -------
+    array
+        The polynomial coefficients, from higher order to lower order.
+
+    Note
+    ----
+    The polynomial is the product of the sections
+    (s**2 + wn/q*s + wn**2)/wn**2 for complex roots,
+    (s**2 + wn**2)/wn**2 for imaginary roots,
+    (s+wn)/wn for real roots, and s for roots at the origin.
+    The real roots and the complex conjugate pairs are expanded
+    by one _poly() call each.
+    """
+    roots = roots[roots.imag >= 0]
+    # Mirror to the left half plane.
+    roots = -abs(roots.real) + 1j*roots.imag
+    real_roots = roots[roots.imag == 0].real
+    complex_roots = roots[roots.imag > 0]
+    complex_roots = np.concatenate((complex_roots, complex_roots.conj()))
+
+    poly_real = _poly(real_roots)
+    poly_complex = _poly(complex_roots).real
+    poly = np.convolve(poly_real, poly_complex)
+    # Unity gain per section, except for roots at the origin.
+    gain = 1 / (np.prod(abs(real_roots[real_roots != 0]))
+                * np.prod(abs(complex_roots)))
+    return gain * poly
+
+
 def clean_tf3(tf, tol_order=5, small_number=1e-25):
     """Remove first coefficient if it is much smaller than the second
 
@@ -644,37 +720,90 @@ def clean_tf3(tf, tol_order=5, small_number=1e-25):
         Remove only if there exists such coefficient in both
         numerator and denominator.
     small_number : float, optional
-        A small number to be added to the log10() in case 0 is encountered.
+        Not used.
+        The coefficients are compared by ratio so no log10() is taken.
 
     Returns
     -------
     tf_cleaned : TransferFunction
         The cleaned TransferFunction
     """
-    num = tf.num[0][0].copy()
-    den = tf.den[0][0].copy()
-    if (abs(np.log10(num[0]) - np.log10(num[1])) > tol_order
-       and abs(np.log10(den[0]) - np.log10(den[1])) > tol_order):
-        #
-        tf_cleaned = control.tf(tf.num[0][0][1:], tf.den[0][0][1:])
+    num = tf.num[0][0]
+    den = tf.den[0][0]
+    threshold = 10**(-tol_order)
+    if (abs(num[0]) < abs(num[1])*threshold
+       and abs(den[0]) < abs(den[1])*threshold):
+        tf_cleaned = control.tf(num[1:], den[1:])
     else:
         tf_cleaned = tf
     return tf_cleaned
 
 
+def _tfval(tf, s):
+    """Evaluate a SISO transfer function at complex frequencies.
+
+    Parameters
+    ----------
+    tf : TransferFunction
+        The transfer function.
+    s : complex or array
+        The complex frequencies.
+
+    Returns
+    -------
+    complex or array
+        The transfer function evaluated at s.
+
+    Note
+    ----
+    This evaluates the numerator and denominator with np.polyval(),
+    avoiding the overhead of TransferFunction.__call__().
+    """
+    num = tf.num[0][0]
+    den = tf.den[0][0]
+    return np.polyval(num, s) / np.polyval(den, s)
+
+
+def _dcgain(tf):
+    """DC gain of a SISO transfer function.
+
+    Parameters
+    ----------
+    tf : TransferFunction
+        The transfer function.
+
+    Returns
+    -------
+    float
+        The DC gain.
+
+    Note
+    ----
+    This is the ratio of the constant coefficients,
+    falling back to TransferFunction.dcgain() if there's a pole
+    at the origin.
+    """
+    num = tf.num[0][0]
+    den = tf.den[0][0]
+    if den[-1] == 0:
+        return float(tf.dcgain())
+    return num[-1] / den[-1]
+
+
 def complex2wq(complex_frequency):
     """Convert a complex frequency to frequency and Q-factor.
 
     Parameters
     ----------
-    complex_frequency : complex
+    complex_frequency : complex or array
         Complex frequency in rad/s.
+        Or, an array of complex frequencies.
 
     Returns
     -------
-    wn : float
+    wn : float or array
         The frequency in rad/s
-    q : float
+    q : float or array
         The Q factor.
     """
     wn = abs(complex_frequency)
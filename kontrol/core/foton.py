@@ -1,5 +1,8 @@
 """KAGRA/LIGO Foton related utilities.
 """
+import functools
+import re
+
 import control
 import numpy as np
 
@@ -7,6 +10,16 @@ import kontrol.core.controlutils
 import kontrol.logger
 
 
+_NUMBER = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+_ZPK_RE = re.compile(
+    r"\s*zpk\(\s*\[([^\]]*)\]\s*,\s*\[([^\]]*)\]\s*,\s*([^,)]+?)\s*"
+    r"(?:,\s*[\"']?([sfn])[\"']?\s*)?\)\s*")
+_RPOLY_RE = re.compile(
+    r"\s*rpoly\(\s*\[([^\]]*)\]\s*,\s*\[([^\]]*)\]\s*,\s*([^,)]+?)\s*\)\s*")
+_ROOT_RE = re.compile(
+    r"\s*({num})(?:\s*([+-])\s*i\*\s*({num}))?\s*".format(num=_NUMBER))
+
+
 def tf2foton(
         tf, expression="zpk", root_location="s", significant_figures=6,
         itol=1e-25, epsilon=1e-25):
@@ -48,10 +61,27 @@ def tf2foton(
         raise ValueError("expression {} not available."
                          "Please select expression from [\"zpk\", \"rpoly\"."
                          "".format(expression))
+    # Fast path: most filters are within the Foton order limit, so skip
+    # tf_order_split() and its root finding and convert them directly.
+    order = max(len(tf.num[0][0]), len(tf.den[0][0])) - 1
+    if order <= 20:
+        tf_min = tf.minreal()
+        if expression == "zpk":
+            return _tf2zpk_fast(
+                tf.zeros(), tf.poles(), tf_min.num[0][0][0],
+                root_location=root_location,
+                significant_figures=significant_figures,
+                itol=itol, epsilon=epsilon)
+        num = tf_min.num[0][0]
+        den = tf_min.den[0][0]
+        if max(len(num), len(den)) <= 20:
+            return _tf2rpoly_fast(
+                num, den, significant_figures=significant_figures)
+
     # Divide tf into tfs with less than 20 order.
     # Do tf conversion.
     # Stack the string
-    foton_expression = ""
+    expressions = []
     tf_list = kontrol.core.controlutils.tf_order_split(tf, max_order=20)
     if len(tf_list) > 1:
         kontrol.logger.logger.warning("The transfer function has "
@@ -61,22 +91,72 @@ def tf2foton(
                                       "multiple expressions with less order.")
     for tf_ in tf_list:
         if expression == "zpk":
-            foton_expression += tf2zpk(
+            expressions.append(tf2zpk(
                 tf_, root_location=root_location,
                 significant_figures=significant_figures,
-                itol=itol, epsilon=epsilon)
+                itol=itol, epsilon=epsilon))
         elif expression == "rpoly":
-            foton_expression += tf2rpoly(
-                tf_, significant_figures=significant_figures)
+            expressions.append(tf2rpoly(
+                tf_, significant_figures=significant_figures))
         else:
-            foton_expression += ""
             print("If you see this, contact maintainer.")
-        foton_expression += "\n\n"
-    foton_expression = foton_expression.rstrip("\n\n")
+    foton_expression = "\n\n".join(expressions)
 
     return foton_expression
 
 
+def tf2foton_batch(
+        tfs, expression="zpk", root_location="s", significant_figures=6,
+        itol=1e-25, epsilon=1e-25):
+    """Convert a list of transfer functions to foton expressions.
+
+    Parameters
+    ----------
+    tfs : list of TransferFunction
+        The transfer functions, e.g. a filter bank.
+    expression: str, optional
+        Format of the foton expression.
+        Choose from ["zpk", "rpoly"].
+        Defaults to "zpk".
+    root_location : str, optional
+        Root location of the zeros and poles for expression=="zpk".
+        Choose from ["s", "f", "n"].
+        Defaults to "s".
+    significant_figures : int, optional
+        Number of significant figures to print out.
+        Defaults to 6.
+    itol : float, optional
+        Treating complex roots as real roots if the ratio of
+        the imaginary part and the real part is smaller than this tolerance
+        Defaults to 1e-25.
+    epsilon : float, optional
+        Small number to add to denominator to prevent division error.
+        Defaults to 1e-25.
+
+    Returns
+    -------
+    foton_expressions : list of str
+        The foton expressions, one for each transfer function.
+
+    Notes
+    -----
+    The options are validated once, before any conversion,
+    so a bad option fails fast instead of after part of the batch.
+    """
+    if expression not in ["zpk", "rpoly"]:
+        raise ValueError("expression {} not available."
+                         "Please select expression from [\"zpk\", \"rpoly\"."
+                         "".format(expression))
+    if expression == "zpk" and root_location not in ["s", "f", "n"]:
+        raise ValueError("Select root_location from [\"s\", \"f\", \"n\"]")
+    return [
+        tf2foton(
+            tf, expression=expression, root_location=root_location,
+            significant_figures=significant_figures, itol=itol,
+            epsilon=epsilon)
+        for tf in tfs]
+
+
 def tf2zpk(tf, root_location="s", significant_figures=6,
            itol=1e-25, epsilon=1e-25):
     """Convert a single transfer function to foton zpk expression.
@@ -115,67 +195,160 @@ def tf2zpk(tf, root_location="s", significant_figures=6,
     """
     # if _order_gt(tf, 20):
     #     raise ValueError("Order of transfer function is not less than 20")
+    return _tf2zpk_fast(
+        tf.zeros(), tf.poles(), tf.minreal().num[0][0][0],
+        root_location=root_location, significant_figures=significant_figures,
+        itol=itol, epsilon=epsilon)
+
+
+def _tf2zpk_fast(zeros, poles, gain, root_location="s",
+                 significant_figures=6, itol=1e-25, epsilon=1e-25):
+    """Foton zpk expression from precomputed zeros, poles and gain.
+
+    Parameters
+    ----------
+    zeros : array
+        Zeros of the transfer function in s-plane.
+    poles : array
+        Poles of the transfer function in s-plane.
+    gain : float
+        Leading numerator coefficient of the minimal realization.
+    root_location : str, optional
+        Root location of the zeros and poles.
+        Choose from ["s", "f", "n"].
+        Defaults to "s".
+    significant_figures : int, optional
+        Number of significant figures to print out.
+        Defaults to 6.
+    itol : float, optional
+        Treating complex roots as real roots if the ratio of
+        the imaginary part and the real part is smaller than this tolerance
+        Defaults to 1e-25.
+    epsilon : float, optional
+        Small number to add to denominator to prevent division error.
+        Defaults to 1e-25.
+
+    Returns
+    -------
+    str
+        The foton zpk expression in selected format.
+    """
     if root_location not in ["s", "f", "n"]:
         raise ValueError("Select root_location from [\"s\", \"f\", \"n\"]")
 
-    zeros = tf.zeros()
-    poles = tf.poles()
-    str_zeros = ""  # String of list of zeros (placeholder)
-    str_poles = ""  # String of list of poles (placeholder)
-
-    # get zeros and poles.
-    if root_location in ["f", "n"]:
-        zeros /= 2*np.pi
-        poles /= 2*np.pi
-    if root_location == "n":
-        zeros = -zeros.conjugate()
-        poles = -poles.conjugate()
-
-    # get zeros and poles list, and sort.
-    z_wn = np.sqrt(tf.zeros().real**2 + tf.zeros().imag**2)
-    p_wn = np.sqrt(tf.poles().real**2 + tf.poles().imag**2)
-    z_sort_arg = z_wn.argsort()
-    p_sort_arg = p_wn.argsort()
-    z_wn.sort()
-    p_wn.sort()
-
-    # get gain
-    gain = tf.minreal().num[0][0][0]
-    if root_location in ["n"]:
-        for wn in p_wn:
-            if wn != 0:
-                gain /= wn
-            else:
-                gain /= 2*np.pi
-        for wn in z_wn:
-            if wn != 0:
-                gain *= wn
-            else:
-                gain *= 2*np.pi
+    zeros, poles, gain_factor = _zpk_prep(zeros, poles, root_location)
+    gain = gain * gain_factor
 
     # Convert to zpk expressing string
-    for zero in zeros[z_sort_arg]:
-        if abs(zero.imag)/abs(zero.real+epsilon) < itol:
-            str_zeros += "{:.{}g}".format(zero.real, significant_figures)
-        else:
-            str_zeros += "{:.{sf}f}+i*{:.{sf}f}".format(
-                zero.real, zero.imag, sf=significant_figures)
-        str_zeros += ";"
-    for pole in poles[p_sort_arg]:
-        if abs(pole.imag)/abs(pole.real+epsilon) < itol:
-            str_poles += "{:.{}g}".format(pole.real, significant_figures)
-        else:
-            str_poles += "{:.{sf}f}+i*{:.{sf}f}".format(
-                pole.real, pole.imag, sf=significant_figures)
-        str_poles += ";"
-    str_zeros = str_zeros.rstrip(";")
-    str_poles = str_poles.rstrip(";")
+    str_zeros = _format_roots(zeros, significant_figures, itol, epsilon)
+    str_poles = _format_roots(poles, significant_figures, itol, epsilon)
     zpk_expression = "zpk([{}],[{}],{:.{}g},\"{}\")".format(
         str_zeros, str_poles, gain, significant_figures, root_location)
 
     return zpk_expression
 
 
+def _zpk_prep(zeros, poles, root_location):
+    """Map s-plane roots to the Foton plane and sort them.
+
+    Parameters
+    ----------
+    zeros : array
+        Zeros of the transfer function in s-plane.
+    poles : array
+        Poles of the transfer function in s-plane.
+    root_location : str
+        Root location of the zeros and poles.
+        Choose from ["s", "f", "n"].
+
+    Returns
+    -------
+    zeros : array
+        Zeros in the selected plane, sorted by natural frequency.
+    poles : array
+        Poles in the selected plane, sorted by natural frequency.
+    gain_factor : float
+        Factor to apply to the leading coefficient of the numerator.
+        1 except for root_location=="n".
+    """
+    z_wn = np.abs(zeros)  # Natural frequencies in rad/s.
+    p_wn = np.abs(poles)
+
+    # get zeros and poles.
+    if root_location == "f":
+        zeros = zeros / (2*np.pi)
+        poles = poles / (2*np.pi)
+    elif root_location == "n":
+        zeros = _negate_conj(zeros, scale=1/(2*np.pi))
+        poles = _negate_conj(poles, scale=1/(2*np.pi))
+
+    # Sort by natural frequency. A stable sort keeps repeated roots and
+    # roots with the same natural frequency in a deterministic order.
+    z_sort_arg = np.argsort(z_wn, kind="stable")
+    p_sort_arg = np.argsort(p_wn, kind="stable")
+
+    gain_factor = 1.
+    if root_location in ["n"]:
+        # Normalize by the natural frequencies, 2*pi for roots at origin.
+        z_eff = np.where(z_wn != 0, z_wn, 2*np.pi)
+        p_eff = np.where(p_wn != 0, p_wn, 2*np.pi)
+        gain_factor = np.prod(z_eff) / np.prod(p_eff)
+    return zeros[z_sort_arg], poles[p_sort_arg], gain_factor
+
+
+def _negate_conj(roots, scale=1.):
+    """Scaled negative complex conjugate of roots, i.e. -conj(roots)*scale.
+
+    Parameters
+    ----------
+    roots : array
+        The zeros or poles.
+    scale : float, optional
+        Scaling factor.
+        Defaults to 1.
+
+    Returns
+    -------
+    array
+        The negated conjugate, in a single new array.
+    """
+    out = roots * -scale
+    np.conjugate(out, out=out)
+    return out
+
+
+def _format_roots(roots, significant_figures, itol, epsilon):
+    """Format roots as a semicolon-separated list of Foton roots.
+
+    Parameters
+    ----------
+    roots : array
+        The zeros or poles.
+    significant_figures : int
+        Number of significant figures to print out.
+    itol : float
+        Treating complex roots as real roots if the ratio of
+        the imaginary part and the real part is smaller than this tolerance
+    epsilon : float
+        Small number to add to the real part to prevent division error.
+
+    Returns
+    -------
+    str
+        The roots, e.g. "1;2+i*3;2+i*-3".
+    """
+    # Build the format specs once instead of nesting them per root.
+    fmt_real = "{{:.{}g}}".format(significant_figures).format
+    fmt_complex = "{{:.{sf}f}}+i*{{:.{sf}f}}".format(
+        sf=significant_figures).format
+    is_real = np.abs(roots.imag) < itol*np.abs(roots.real+epsilon)
+    # Plain Python numbers format faster than NumPy scalars.
+    return ";".join(
+        fmt_real(real) if is_real_ else fmt_complex(real, imag)
+        for real, imag, is_real_ in zip(
+            roots.real.tolist(), roots.imag.tolist(), is_real.tolist()))
+
+
 def tf2rpoly(tf, significant_figures=6):
     """Convert a transfer function to foton rpoly expression.
 
@@ -196,24 +369,39 @@ def tf2rpoly(tf, significant_figures=6):
     -----
     Only works for transfer functions with less than 20 orders.
     """
-    if _order_gt(tf, 20):
+    tf_min = tf.minreal()
+    num = tf_min.num[0][0]
+    den = tf_min.den[0][0]
+    if max(len(num), len(den)) > 20:
         raise ValueError("Order of transfer function is not less than 20")
 
-    num = tf.minreal().num[0][0]
-    den = tf.minreal().den[0][0]
-    str_num = ""  # String of numerator coefficients
-    str_den = ""  # String of numerator coefficients
+    return _tf2rpoly_fast(num, den, significant_figures=significant_figures)
+
+
+def _tf2rpoly_fast(num, den, significant_figures=6):
+    """Foton rpoly expression from precomputed coefficients.
+
+    Parameters
+    ----------
+    num : array
+        Numerator coefficients of the minimal realization.
+    den : array
+        Denominator coefficients of the minimal realization.
+    significant_figures : int, optional
+        Number of significant figures to print out.
+        Defaults to 6.
+
+    Returns
+    -------
+    str :
+        Foton express in foton rpoly expression.
+    """
     gain = num[0]
-    num /= num[0]
-
-    for coef in num:
-        str_num += "{:.{}g}".format(coef, significant_figures)
-        str_num += ";"
-    for coef in den:
-        str_den += "{:.{}g}".format(coef, significant_figures)
-        str_den += ";"
-    str_num = str_num.rstrip(";")
-    str_den = str_den.rstrip(";")
+    num = num / gain
+
+    fmt = "{{:.{}g}}".format(significant_figures).format
+    str_num = ";".join(map(fmt, num))  # String of numerator coefficients
+    str_den = ";".join(map(fmt, den))  # String of denominator coefficients
     rpoly_expression = "rpoly([{}],[{}],{})".format(str_num, str_den, gain)
 
     return rpoly_expression
@@ -234,8 +422,9 @@ def _order(tf):
     nden : int
         Number of coefficients in denominator.
     """
-    nnum = len(tf.minreal().num[0][0])
-    nden = len(tf.minreal().den[0][0])
+    tf_min = tf.minreal()
+    nnum = len(tf_min.num[0][0])
+    nden = len(tf_min.den[0][0])
     return nnum, nden
 
 
@@ -294,56 +483,42 @@ def zpk2tf(foton_string):
     tf : TransferFunction
         The transfer function.
     """
-    foton_string = foton_string.replace(" ", "")
-    foton_string = foton_string.lstrip("zpk(")
-    foton_string = foton_string.rstrip(")")
-    split = foton_string.split(",")
-    if len(split) == 3:
-        z_string, p_string, gain_string = split
+    num, den = _zpk2coefficients(foton_string)
+    return kontrol.TransferFunction(np.array(num), np.array(den))
+
+
+@functools.lru_cache(maxsize=1024)
+def _zpk2coefficients(foton_string):
+    """Cached parsing of a Foton ZPK string.
+
+    Parameters
+    ----------
+    foton_string : str
+        The Foton ZPK string, e.g. zpk([0], [1; 1], 1, "n").
+
+    Returns
+    -------
+    num : tuple
+        Numerator coefficients.
+    den : tuple
+        Denominator coefficients.
+
+    Notes
+    -----
+    Tuples are returned so the cached values cannot be modified
+    through the returned transfer functions.
+    """
+    match = _ZPK_RE.fullmatch(foton_string)
+    if match is None:
+        raise ValueError("Foton zpk string {} not recognized."
+                         "".format(foton_string))
+    z_string, p_string, gain_string, root_location = match.groups()
+    if root_location is None:
         root_location = "s"
-    else:
-        z_string, p_string, gain_string, root_location = split
-
-    def process_zp_string(zp_string):
-        zp_string = zp_string.replace("[", "")
-        zp_string = zp_string.replace("]", "")
-        zp_string = zp_string.split(";")
-        zp = []
-        if zp_string == [""]:
-            return np.array(zp)
-        for string in zp_string:
-            # split real and imaginary
-            split = string.split("i*")
-            if len(split) == 2:
-                real_string, imag_string = split
-                sign = real_string[-1]
-                if imag_string[0] == "-":
-                    if sign == "-":
-                        sign = "+"
-                    elif sign == "+":
-                        sign = "-"
-                    imag_string = imag_string.lstrip("-")
-                if imag_string[0] == "+":
-                    imag_string = imag_string.lstrip("+")
-
-            else:
-                real_string, = split
-                imag_string = "0"
-                sign = "+"
-            real_string = real_string.rstrip("+")
-            real_string = real_string.rstrip("-")
-
-            zp_complex = f"{real_string}{sign}{imag_string}j"
-            zp.append(complex(zp_complex))
-        zp = np.array(zp)
-        return zp
-
-    zeros = process_zp_string(z_string)
-    poles = process_zp_string(p_string)
-    gain = float(gain_string)
 
-    root_location = root_location.replace("'", "")
-    root_location = root_location.replace('"', "")
+    zeros = _parse_roots(z_string)
+    poles = _parse_roots(p_string)
+    gain = float(gain_string)
 
     if root_location in "nf":
         # zeros poles are in Hz. Gain is DC.
@@ -360,43 +535,38 @@ def zpk2tf(foton_string):
     #     poles = -poles
 
     tf = get_zpk2tf((zeros, poles, gain))
-    # print(root_location)
-
-    # tf = control.tf([1], [1])
-    # s = control.tf("s")
-
-    # for zero in zeros:
-    #     if zero == 0:
-    #         tf *= (s+zero)/(2*np.pi)
-    #     elif zero.imag > 0 and zero.real != 0:
-    #         wn = np.sqrt(zero.real**2 + zero.imag**2)
-    #         q = wn / (2*zero.real)
-    #         tf *= (s**2 + wn/q*s + wn**2) / wn**2
-    #     elif zero.imag > 0 and zero.real == 0:
-    #         wn = zero.imag
-    #         tf *= (s**2 + wn**2)/wn**2
-    #     elif zero.imag == 0 and zero.real != 0:
-    #         tf *= (s+zero.real)/zero.real
-
-    # for pole in poles:
-    #     if pole == 0:
-    #         tf /= (s+pole)/(2*np.pi)
-    #     elif pole.imag > 0 and pole.real != 0:
-    #         wn = np.sqrt(pole.real**2 + pole.imag**2)
-    #         q = wn / (2*pole.real)
-    #         tf /= (s**2 + wn/q*s + wn**2) / wn**2
-    #     elif pole.imag > 0 and pole.real == 0:
-    #         wn = pole.imag
-    #         tf /= (s**2 + wn**2)/wn**2
-    #     elif pole.imag == 0 and pole.real != 0:
-    #         tf /= (s+pole.real)/pole.real
-
-    # if root_location == "n":
-    #     tf *= gain
-    # elif root_location in "sf":
-    #     tf *= gain / (tf.num[0][0][0]/tf.den[0][0][0])
-
-    return kontrol.TransferFunction(tf)
+
+    return tuple(tf.num[0][0]), tuple(tf.den[0][0])
+
+
+def _parse_roots(roots_string):
+    """Parse a Foton list of roots, e.g. "0; 1+i*2; 1-i*2".
+
+    Parameters
+    ----------
+    roots_string : str
+        The semicolon-separated roots, without the brackets.
+
+    Returns
+    -------
+    array
+        The complex roots.
+    """
+    if roots_string.strip() == "":
+        return np.array([])
+    reals = []
+    imags = []
+    for root_string in roots_string.split(";"):
+        match = _ROOT_RE.fullmatch(root_string)
+        if match is None:
+            raise ValueError("Foton root {} not recognized."
+                             "".format(root_string))
+        real_string, sign, imag_string = match.groups()
+        imag = 0. if imag_string is None else float(imag_string)
+        reals.append(float(real_string))
+        imags.append(-imag if sign == "-" else imag)
+    return (np.asarray(reals, dtype=np.float64)
+            + 1j*np.asarray(imags, dtype=np.float64))
 
 
 def get_zpk2tf(get_zpk, plane="s"):
@@ -431,41 +601,51 @@ def get_zpk2tf(get_zpk, plane="s"):
         zeros = -zeros
         poles = -poles
 
-    tf = control.tf([1], [1])
-    s = control.tf("s")
-
-    for zero in zeros:
-        if zero == 0:
-            tf *= (s+zero)/(2*np.pi)
-        elif zero.imag > 0 and zero.real != 0:
-            wn = np.sqrt(zero.real**2 + zero.imag**2)
-            q = wn / (2*zero.real)
-            tf *= (s**2 + wn/q*s + wn**2) / wn**2
-        elif zero.imag > 0 and zero.real == 0:
-            wn = zero.imag
-            tf *= (s**2 + wn**2)/wn**2
-        elif zero.imag == 0 and zero.real != 0:
-            tf *= (s+zero.real)/zero.real
-
-    for pole in poles:
-        if pole == 0:
-            tf /= (s+pole)/(2*np.pi)
-        elif pole.imag > 0 and pole.real != 0:
-            wn = np.sqrt(pole.real**2 + pole.imag**2)
-            q = wn / (2*pole.real)
-            tf /= (s**2 + wn/q*s + wn**2) / wn**2
-        elif pole.imag > 0 and pole.real == 0:
-            wn = pole.imag
-            tf /= (s**2 + wn**2)/wn**2
-        elif pole.imag == 0 and pole.real != 0:
-            tf /= (s+pole.real)/pole.real
+    num, num_scale = _zpk_factors(zeros)
+    den, den_scale = _zpk_factors(poles)
 
     if plane == "n":
-        tf *= gain
-    elif plane in "sf":
-        tf *= gain / (tf.num[0][0][0]/tf.den[0][0][0])
+        gain = gain * num_scale / den_scale
 
-    return kontrol.TransferFunction(tf)
+    return kontrol.TransferFunction(gain*num, den)
+
+
+def _zpk_factors(roots):
+    """Expand the factors of get_zpk2tf() into one polynomial.
+
+    Parameters
+    ----------
+    roots : array
+        The zeros or poles, in the (s+z), (s+p) convention.
+
+    Returns
+    -------
+    coefficients : array
+        Monic polynomial coefficients, from higher order to lower order.
+    scale : float
+        The product of the factor normalizations.
+
+    Notes
+    -----
+    Roots at the origin give s/(2*pi).
+    Real roots z give (s+z)/z.
+    Complex roots with positive imaginary part give
+    (s**2 + 2*z.real*s + |z|**2)/|z|**2,
+    while the ones with negative imaginary part are skipped.
+    """
+    origin = roots == 0
+    real = (roots.imag == 0) & ~origin
+    upper = roots.imag > 0
+    factor_roots = np.concatenate(
+        (-roots[origin | real], -roots[upper], -roots[upper].conjugate()))
+    scale = ((2*np.pi)**-np.count_nonzero(origin)
+             / np.prod(roots[real].real)
+             / np.prod(np.abs(roots[upper])**2))
+    # polyfromroots() multiplies the factors pairwise instead of one root at
+    # a time like np.poly(). Its ascending coefficients are reversed.
+    coefficients = np.polynomial.polynomial.polyfromroots(
+        factor_roots)[::-1].real
+    return coefficients, scale
 
 
 def rpoly2tf(foton_string):
@@ -476,29 +656,43 @@ def rpoly2tf(foton_string):
     foton_string : str
         The rpoly Foton string. E.g. rpoly([1; 2; 3], [2; 3; 4], 5)
     """
-    foton_string = foton_string.lstrip("rpoly")
-    foton_string = foton_string.replace(" ", "")
-    foton_string = foton_string.replace("(", "")
-    foton_string = foton_string.replace(")", "")
-    num_string, den_string, gain_string = foton_string.split(",")
+    num, den = _rpoly2coefficients(foton_string)
+    return kontrol.TransferFunction(np.array(num), np.array(den))
+
+
+@functools.lru_cache(maxsize=1024)
+def _rpoly2coefficients(foton_string):
+    """Cached parsing of an rpoly Foton string.
+
+    Parameters
+    ----------
+    foton_string : str
+        The rpoly Foton string. E.g. rpoly([1; 2; 3], [2; 3; 4], 5)
+
+    Returns
+    -------
+    num : tuple
+        Numerator coefficients, including the gain.
+    den : tuple
+        Denominator coefficients.
+    """
+    match = _RPOLY_RE.fullmatch(foton_string)
+    if match is None:
+        raise ValueError("Foton rpoly string {} not recognized."
+                         "".format(foton_string))
+    num_string, den_string, gain_string = match.groups()
 
     def string2floatarray(string):
         """Convert a string of float array to array"""
-        string = string.replace("[", "")
-        string = string.replace("]", "")
-        string = string.split(";")
-        float_array = []
-        if string == [""]:
-            return np.array(float_array)
-        for value in string:
-            float_array.append(float(value))
-        return np.array(float_array)
+        if string.strip() == "":
+            return np.array([])
+        return np.array([float(value) for value in string.split(";")])
     num = string2floatarray(num_string)
     den = string2floatarray(den_string)
     gain = float(gain_string)
     tf = control.tf(num, den)
     tf *= gain
-    return kontrol.TransferFunction(tf)
+    return tuple(tf.num[0][0]), tuple(tf.den[0][0])
 
 
 def notch(frequency, q, depth, significant_figures=6):
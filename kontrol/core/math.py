@@ -21,9 +21,12 @@ def mse(x1, x2, weight=None):
     float
         Mean square error between arrays x1 and x2.
     """
-    if weight is None:
-        weight = np.ones_like(x1)
-    return np.mean(np.square(np.subtract(x2, x1)*weight))
+    error = np.subtract(x2, x1)
+    if weight is not None:
+        error = error * weight
+    # Sum of squares as one dot product, no squared buffer.
+    error = np.ravel(error)
+    return np.dot(error, error) / error.size
 
 
 def log_mse(x1, x2, weight=None, small_multiplier=1e-6):
@@ -49,14 +52,18 @@ def log_mse(x1, x2, weight=None, small_multiplier=1e-6):
     float
         Logarithmic mean square error between arrays x1 and x2.
     """
-    if 0 in x1 and 0 in x2:
+    x1_has_zero = np.any(np.equal(x1, 0))
+    x2_has_zero = np.any(np.equal(x2, 0))
+    if x1_has_zero and x2_has_zero:
         raise ValueError("zero value exists in both 'x1' and 'x2'"
                          "Can't take np.log10()")
-    elif 0 in x1:
-        x1 += small_multiplier * np.min(x2)
-    elif 0 in x2:
-        x2 += small_multiplier * np.min(x1)
-    return mse(x1=np.log10(x1), x2=np.log10(x2), weight=weight)
+    elif x1_has_zero:
+        x1 = np.add(x1, small_multiplier * np.min(x2))  # Not in place.
+    elif x2_has_zero:
+        x2 = np.add(x2, small_multiplier * np.min(x1))
+    # log10(x2) - log10(x1) as one logarithm of the ratio.
+    log_ratio = np.log10(np.divide(x2, x1))
+    return mse(x1=0, x2=log_ratio, weight=weight)
 
 
 def quad_sum(*spectra):
@@ -73,17 +80,27 @@ def quad_sum(*spectra):
             The quadrature sum of the spectra.
 
     """
-    qs = np.zeros_like(spectra[0])
-#     print(args[0])
-    for i in spectra:
-        for j in range(len(i)):
-            qs[j] = np.sqrt(qs[j]**2 + i[j]**2)
+    qs = np.zeros_like(spectra[0], dtype=float)
+    for spectrum in spectra:
+        qs += np.square(spectrum)
+    np.sqrt(qs, out=qs)
     return qs
 
 
 def polyval(p, x):
+    # Horner's scheme, one in-place multiply-add per coefficient.
+    # Each step is already data-parallel across x, so there is no
+    # loop-carried dependency to break up with Estrin's scheme.
     y = np.zeros(x.shape, dtype=x.dtype)
-    for i, v in enumerate(p):
+    if len(p) == 0:
+        return y
+    if x.ndim == 1 and len(x) <= 128:
+        # For a handful of points, the per-coefficient ufunc dispatch
+        # dominates. One Vandermonde matrix product does it in two calls.
+        y += np.vander(x, len(p)) @ p
+        return y
+    y += p[0]
+    for v in p[1:]:
         y *= x
         y += v
     return y
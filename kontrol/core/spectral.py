@@ -1,6 +1,8 @@
 """Spectral analysis related function library.
 """
 import numpy as np
+import scipy.fft
+import scipy.integrate
 import scipy.signal
 
 
@@ -39,7 +41,7 @@ def two_channel_correlation(psd, coh):
         presence of large background signals. Review of Scientific Instruments,
         69:2767–2772, 07 1998.
     """
-    noise = psd * (1 - coh**0.5)
+    noise = psd * (1 - np.sqrt(coh))
     return noise
 
 
@@ -121,28 +123,28 @@ def three_channel_correlation(psd1, psd2=None, psd3=None,
         Bulletin of the Seismological Society of America, 96:258–271, 2006.
     """
     if csd12 is None:
-        if all([csd21 is not None, psd1 is not None, psd2 is not None]):
+        if csd21 is not None and psd1 is not None and psd2 is not None:
             csd12 = psd1*psd2/csd21
     if csd13 is None:
-        if all([csd31 is not None, psd1 is not None, psd3 is not None]):
+        if csd31 is not None and psd1 is not None and psd3 is not None:
             csd13 = psd1*psd3/csd31
     if csd21 is None:
-        if all([csd12 is not None, psd2 is not None, psd1 is not None]):
+        if csd12 is not None and psd2 is not None and psd1 is not None:
             csd21 = psd2*psd1/csd12
     if csd23 is None:
-        if all([csd32 is not None, psd2 is not None, psd3 is not None]):
+        if csd32 is not None and psd2 is not None and psd3 is not None:
             csd23 = psd2*psd3/csd32
     if csd31 is None:
-        if all([csd13 is not None, psd3 is not None, psd1 is not None]):
+        if csd13 is not None and psd3 is not None and psd1 is not None:
             csd31 = psd3*psd1/csd13
     if csd32 is None:
-        if all([csd23 is not None, psd3 is not None, psd2 is not None]):
+        if csd23 is not None and psd3 is not None and psd2 is not None:
             csd32 = psd3*psd2/csd23
     if returnall:
-        if any([psd2 is None, psd3 is None,
-                csd12 is None, csd13 is None,
-                csd21 is None, csd23 is None,
-                csd31 is None, csd32 is None]):
+        if (psd2 is None or psd3 is None
+                or csd12 is None or csd13 is None
+                or csd21 is None or csd23 is None
+                or csd31 is None or csd32 is None):
             raise ValueError("If returnall is True,"
                              " at least psd2, psd3"
                              " (csd13 or csd31),"
@@ -156,10 +158,10 @@ def three_channel_correlation(psd1, psd2=None, psd3=None,
             psd3, csd13=csd32, csd23=csd12, csd21=csd13, returnall=False)
         return noise1, noise2, noise3
     else:
-        if any([csd13 is None, csd23 is None, csd21 is None]):
+        if csd13 is None or csd23 is None or csd21 is None:
             raise ValueError("(csd13 or csd31), (csd23 or csd32),"
                              " and (csd21 or csd12) must be provided")
-        return abs(psd1-csd13/csd23*csd21)
+        return np.abs(psd1 - csd13/csd23*csd21)
 
 
 def asd2ts(asd, f=None, fs=None, t=None, window=None, zero_mean=True):
@@ -219,10 +221,13 @@ def asd2ts(asd, f=None, fs=None, t=None, window=None, zero_mean=True):
     # Compute absolute value of the FFT
     abs_ym = asd*np.sqrt(fs*s2)
     # Assume ASD is noise and generate random phase for the FFT
-    random_phase = np.random.random(len(abs_ym))*360-180
-    # Convert abs(FFT) to FFT by adding random phase
-    ym = abs_ym * np.exp(1j*random_phase)
-    ts = np.fft.irfft(ym)
+    random_phase = np.random.uniform(-np.pi, np.pi, len(abs_ym))
+    # Convert abs(FFT) to FFT by adding random phase,
+    # writing the real and imaginary parts directly.
+    ym = np.empty(len(abs_ym), dtype=complex)
+    np.multiply(abs_ym, np.cos(random_phase), out=ym.real)
+    np.multiply(abs_ym, np.sin(random_phase), out=ym.imag)
+    ts = scipy.fft.irfft(ym)
 
     if zero_mean:
         ts -= np.mean(ts)
@@ -275,23 +280,20 @@ def asd2rms(asd, f=None, df=1., return_series=True):
     When ``return_series`` is False, only :math:`x_\mathrm{RMS}(0)` is
     returned.
     """
-    # Flip the ASD to integrate from high frequency to low.
-    # if f is not None:
-    #     f_inv = -np.flip(f)  # Minus sign necessary as integration limits
-    #                          # are flipped
-    # else:
-    #     f_inv = None
-    # asd_inv = np.flip(asd)
     if not return_series:
         rms = np.sqrt(np.trapz(y=asd**2, x=f, dx=df))
     else:
-        rms = np.zeros_like(asd)
-        for i in range(len(rms)):
-            if f is None:
-                rms[i] = np.sqrt(np.trapz(y=asd[i:]**2, dx=df))
-            else:
-                rms[i] = np.sqrt(np.trapz(y=asd[i:]**2, x=f[i:]))
-        # rms = np.flip(rms)
+        # Flip the ASD to integrate from high frequency to low,
+        # all partial integrals in one cumulative pass.
+        psd_inv = np.flip(asd)**2
+        if f is None:
+            ms_inv = scipy.integrate.cumulative_trapezoid(
+                psd_inv, dx=df, initial=0)
+        else:
+            # Minus sign necessary as integration limits are flipped.
+            ms_inv = scipy.integrate.cumulative_trapezoid(
+                psd_inv, x=-np.flip(f), initial=0)
+        rms = np.sqrt(np.flip(ms_inv))
     return rms
 
 
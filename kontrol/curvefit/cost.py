@@ -1,5 +1,6 @@
 """Cost function base class
 """
+import numpy as np
 
 
 class Cost:
@@ -28,7 +29,14 @@ class Cost:
         Parameters
         ----------
         args : array
-            Arguments passed to the model
+            Arguments passed to the model.
+            A 2-D array of shape (nargs, S) is evaluated as a batch of
+            S parameter sets, one per column, as passed by
+            ``scipy.optimize.differential_evolution(vectorized=True)``.
+            If ``model.vectorized`` is true, the batch is passed to
+            the model in one call, and the error function must return
+            one error per response, e.g. ``spectrum_error(..., axis=-1)``.
+            Otherwise, the parameter sets are evaluated one by one.
         model : func(xdata: array, args: array, **model_kwargs) -> array
             Model used to fit the data.
         x_data : array
@@ -40,15 +48,23 @@ class Cost:
 
         Returns
         -------
-        float
+        float or array
             Evaluated error function.
+            An array of S errors if ``args`` is a batch.
         """
         if model_kwargs is None:
             model_kwargs = {}
+        if np.ndim(args) == 2 and not getattr(model, "vectorized", False):
+            return np.array([
+                self(_args, model, xdata, ydata, model_kwargs)
+                for _args in np.transpose(args)])
         y_model = model(xdata, args, **model_kwargs)
         error_func = self.error_func
         error_func_kwargs = self.error_func_kwargs
         error = error_func(ydata, y_model, **error_func_kwargs)
+        if np.ndim(args) == 2 and np.shape(error) != np.shape(args)[1:]:
+            raise ValueError("The error function must return one error "
+                             "per parameter set for a vectorized model.")
         return error
 
     @property
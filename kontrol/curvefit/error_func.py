@@ -21,9 +21,12 @@ def mse(x1, x2, weight=None):
     float
         Mean square error between arrays x1 and x2.
     """
-    if weight is None:
-        weight = np.ones_like(x1)
-    return np.mean(np.square(np.subtract(x2, x1)*weight))
+    error = np.subtract(x2, x1)
+    if weight is not None:
+        error = error * weight
+    # Sum of squares as one dot product, no squared buffer.
+    error = np.ravel(error)
+    return np.dot(error, error) / error.size
 
 
 def log_mse(x1, x2, weight=None, small_multiplier=1e-6):
@@ -49,14 +52,18 @@ def log_mse(x1, x2, weight=None, small_multiplier=1e-6):
     float
         Logarithmic mean square error between arrays x1 and x2.
     """
-    if 0 in x1 and 0 in x2:
+    x1_has_zero = np.any(np.equal(x1, 0))
+    x2_has_zero = np.any(np.equal(x2, 0))
+    if x1_has_zero and x2_has_zero:
         raise ValueError("zero value exists in both 'x1' and 'x2'"
                          "Can't take np.log10()")
-    elif 0 in x1:
-        x1 += small_multiplier * np.min(x2)
-    elif 0 in x2:
-        x2 += small_multiplier * np.min(x1)
-    return mse(x1=np.log10(x1), x2=np.log10(x2), weight=weight)
+    elif x1_has_zero:
+        x1 = np.add(x1, small_multiplier * np.min(x2))  # Not in place.
+    elif x2_has_zero:
+        x2 = np.add(x2, small_multiplier * np.min(x1))
+    # log10(x2) - log10(x1) as one logarithm of the ratio.
+    log_ratio = np.log10(np.divide(x2, x1))
+    return mse(x1=0, x2=log_ratio, weight=weight)
 
 
 def tf_error(tf1, tf2, weight=None, small_number=1e-6, norm=2):
@@ -99,7 +106,8 @@ def tf_error(tf1, tf2, weight=None, small_number=1e-6, norm=2):
     return np.mean(np.log10(abs(tf1-tf2)**norm + small_number) * weight)
 
 
-def noise_error(noise1, noise2, weight=None, small_number=1e-6, norm=2):
+def noise_error(noise1, noise2, weight=None, small_number=1e-6, norm=2,
+                axis=None):
     r"""Mean log error between two noise spectrums.
 
     Parameters
@@ -122,10 +130,15 @@ def noise_error(noise1, noise2, weight=None, small_number=1e-6, norm=2):
         Other norms are are possible but not encouraged unless
         there's a specifiy reason.
         Defaults 2.
+    axis : int or None, optional
+        The axis along which the mean is taken.
+        Use ``-1`` to get one error per spectrum
+        for a stack of spectra.
+        Defaults None, the mean over all values.
 
     Returns
     -------
-    float
+    float or array
         The mean log error.
 
     Notes
@@ -134,13 +147,15 @@ def noise_error(noise1, noise2, weight=None, small_number=1e-6, norm=2):
     $\mathcal{L}_2$ norm is more susceptible to outliers, but fits
     data with large dynamic range well.
     """
-    if weight is None:
-        weight = np.ones_like(noise1, dtype=float)
-    return np.mean((np.log10(abs(noise1))-np.log10(abs(noise2)))**norm*weight)
+    # log10(|noise1|/|noise2|) takes one logarithm instead of two.
+    error = np.log10(np.abs(noise1)/np.abs(noise2))**norm
+    if weight is not None:
+        error = error * weight
+    return np.mean(error, axis=axis)
 
 
 def spectrum_error(spectrum1, spectrum2,
-                   weight=None, small_number=1e-6, norm=2):
+                   weight=None, small_number=1e-6, norm=2, axis=None):
     r"""Mean log error between two spectrums. Alias of noise_error().
 
     Parameters
@@ -163,10 +178,15 @@ def spectrum_error(spectrum1, spectrum2,
         Other norms are are possible but not encouraged unless
         there's a specifiy reason.
         Defaults 2.
+    axis : int or None, optional
+        The axis along which the mean is taken.
+        Use ``-1`` to get one error per spectrum
+        for a stack of spectra.
+        Defaults None, the mean over all values.
 
     Returns
     -------
-    float
+    float or array
         The mean log error.
 
     Notes
@@ -176,4 +196,5 @@ def spectrum_error(spectrum1, spectrum2,
     data with large dynamic range well.
     """
     return noise_error(spectrum1, spectrum2,
-                       weight=weight, small_number=small_number, norm=norm)
+                       weight=weight, small_number=small_number, norm=norm,
+                       axis=axis)
@@ -4,6 +4,11 @@
 
 class Model:
     """Model base class for curve fitting"""
+    # Set to True in child classes whose _x2y() also takes a batch of
+    # args of shape (nargs, S) and returns the S responses stacked
+    # along the first axis.
+    vectorized = False
+
     def __init__(self, args=None, nargs=None, log_args=False):
         """Constructor
 
@@ -272,6 +272,8 @@ class SimpleZPK(Model):
        G(s; z_1, z_2,..., p_1, p_2, ..., k)
        = k\frac{\prod_i(\frac{s}{2\pi z_i}+1)}{\prod_j(\frac{s}{2\pi p_j}+1)}
     """
+    vectorized = True
+
     def __init__(self, nzero, npole, args=None, log_args=False):
         r"""Constructor.
 
@@ -304,11 +306,15 @@ class SimpleZPK(Model):
     def _x2y(self, x, xunit="Hz"):
         """ZPK model frequency response."""
         s = _x2s(x, xunit)
-        tf = np.ones_like(s) * self.gain
-        for i in range(len(self.zero)):
-            tf *= s/(2*np.pi*self.zero[i]) + 1
-        for i in range(len(self.pole)):
-            tf /= s/(2*np.pi*self.pole[i]) + 1
+        # One row of (s/wn + 1) per root, zeros first, then poles.
+        # The products reduce along rows of contiguous frequencies.
+        # With a batch of args, each row is (S, len(s)) instead.
+        wn = 2*np.pi*np.concatenate([self.zero, self.pole])
+        factors = np.multiply.outer(1/wn, s)
+        factors += 1
+        tf = np.prod(factors[:self.nzero], axis=0)
+        tf *= _batch_gain(self.gain, s)
+        tf /= np.prod(factors[self.nzero:], axis=0)
         return tf
 
     @property
@@ -339,11 +345,14 @@ class SimpleZPK(Model):
     @args.setter
     def args(self, _args):
         """args.setter"""
+        self._tf_cache = None  # New arguments, new tf.
         if _args is None:
             self._args = None
         elif len(_args) != self.nzero + self.npole + 1:
             raise ValueError("Length of argument must match nzero and npole.")
         else:
+            # One contiguous float array, so zero, pole and gain are views.
+            _args = np.asarray(_args, dtype=float)
             if self.log_args:
                 _args = 10**_args
             self._args = _args
@@ -368,13 +377,19 @@ class SimpleZPK(Model):
     @property
     def tf(self):
         """Returns a TransferFunction object of this ZPK model"""
-        s = control.tf("s")
-        tf = control.tf([self.gain], [1])
-        for i in range(len(self.zero)):
-            tf *= s/(2*np.pi*self.zero[i]) + 1
-        for i in range(len(self.pole)):
-            tf /= s/(2*np.pi*self.pole[i]) + 1
-        return kontrol.TransferFunction(tf)
+        # Keyed on the values, so args modified in place are picked up.
+        key = self.args.tobytes()
+        if self._tf_cache is None or self._tf_cache[0] != key:
+            s = control.tf("s")
+            zero = self.zero
+            pole = self.pole
+            tf = control.tf([self.gain], [1])
+            for i in range(len(zero)):
+                tf *= s/(2*np.pi*zero[i]) + 1
+            for i in range(len(pole)):
+                tf /= s/(2*np.pi*pole[i]) + 1
+            self._tf_cache = (key, (tf.num[0][0], tf.den[0][0]))
+        return _coefficients2tf(self._tf_cache[1])
 
 
 class ComplexZPK(Model):
@@ -423,6 +438,8 @@ class ComplexZPK(Model):
        {\prod_j(\frac{s^2}{(2\pi f_j)^2} + \frac{1}{2\pi f_j q_j}s + 1)}
 
     """
+    vectorized = True
+
     def __init__(
             self, nzero_pairs, npole_pairs, args=None, log_args=False):
         r"""Constructor.
@@ -476,21 +493,19 @@ class ComplexZPK(Model):
     def _x2y(self, x, xunit="Hz"):
         """ZPK model (complex) frequency response."""
         s = _x2s(x, xunit)
-        fn_zero = self.fn_zero
-        q_zero = self.q_zero
-        fn_pole = self.fn_pole
-        q_pole = self.q_pole
-        num = np.ones_like(s) * self.gain
-        den = np.ones_like(s)
-        for i in range(len(fn_zero)):
-            num *= (1 / (2*np.pi*fn_zero[i])**2 * s**2
-                    + 1 / (2*np.pi*fn_zero[i]*q_zero[i]) * s
-                    + 1)
-        for i in range(len(fn_pole)):
-            den *= (1 / (2*np.pi*fn_pole[i])**2 * s**2
-                    + 1 / (2*np.pi*fn_pole[i]*q_pole[i]) * s
-                    + 1)
-        return num/den
+        # One row of (s**2/wn**2 + s/(wn*q) + 1) per complex pair,
+        # zeros first, then poles.
+        # With a batch of args, each row is (S, len(s)) instead.
+        wn = 2*np.pi*np.concatenate([self.fn_zero, self.fn_pole])
+        q = np.concatenate([self.q_zero, self.q_pole])
+        factors = np.multiply.outer(1/wn**2, s**2)
+        factors += np.multiply.outer(1/(wn*q), s)
+        factors += 1
+        nzero_pairs = len(self.fn_zero)
+        num = np.prod(factors[:nzero_pairs], axis=0)
+        num *= _batch_gain(self.gain, s)
+        num /= np.prod(factors[nzero_pairs:], axis=0)
+        return num
 
     @property
     def nzero_pairs(self):
@@ -520,6 +535,7 @@ class ComplexZPK(Model):
     @args.setter
     def args(self, _args):
         """args.setter"""
+        self._tf_cache = None  # New arguments, new tf.
         if _args is None:
             self._args = None
         elif np.mod(len(_args), 2) != 1:
@@ -530,6 +546,7 @@ class ComplexZPK(Model):
             raise ValueError("Length of argument must match the specfied "
                              "nzero_pairs and npole_pairs.")
         else:
+            _args = np.asarray(_args, dtype=float)
             if self.log_args:
                 _args = 10**_args
             self._args = _args
@@ -562,27 +579,69 @@ class ComplexZPK(Model):
     @property
     def tf(self):
         """Returns a TransferFunction object of this ZPK model"""
-        s = control.tf("s")
-        fn_zero = self.fn_zero
-        q_zero = self.q_zero
-        fn_pole = self.fn_pole
-        q_pole = self.q_pole
-        k = self.gain
-        num = control.tf([k], [1])
-        den = control.tf([1], [1])
-        for i in range(len(fn_zero)):
-            num *= (1 / (2*np.pi*fn_zero[i])**2 * s**2
-                    + 1 / (2*np.pi*fn_zero[i]*q_zero[i]) * s
-                    + 1)
-        for i in range(len(fn_pole)):
-            den *= (1 / (2*np.pi*fn_pole[i])**2 * s**2
-                    + 1 / (2*np.pi*fn_pole[i]*q_pole[i]) * s
-                    + 1)
-        return kontrol.TransferFunction(num/den)
+        # Keyed on the values, so args modified in place are picked up.
+        key = self.args.tobytes()
+        if self._tf_cache is None or self._tf_cache[0] != key:
+            s = control.tf("s")
+            fn_zero = self.fn_zero
+            q_zero = self.q_zero
+            fn_pole = self.fn_pole
+            q_pole = self.q_pole
+            k = self.gain
+            num = control.tf([k], [1])
+            den = control.tf([1], [1])
+            for i in range(len(fn_zero)):
+                num *= (1 / (2*np.pi*fn_zero[i])**2 * s**2
+                        + 1 / (2*np.pi*fn_zero[i]*q_zero[i]) * s
+                        + 1)
+            for i in range(len(fn_pole)):
+                den *= (1 / (2*np.pi*fn_pole[i])**2 * s**2
+                        + 1 / (2*np.pi*fn_pole[i]*q_pole[i]) * s
+                        + 1)
+            tf = num/den
+            self._tf_cache = (key, (tf.num[0][0], tf.den[0][0]))
+        return _coefficients2tf(self._tf_cache[1])
 
 
 # TODO add support for a generic ZPK model
 
+def _coefficients2tf(coefficients):
+    """Fresh TransferFunction from cached coefficients.
+
+    Parameters
+    ----------
+    coefficients : tuple(array, array)
+        The numerator and denominator coefficients.
+
+    Returns
+    -------
+    kontrol.TransferFunction
+        The transfer function.
+        It owns copies of the coefficients,
+        so modifying it does not change the cache.
+    """
+    num, den = coefficients
+    return kontrol.TransferFunction(num.copy(), den.copy())
+
+
+def _batch_gain(gain, s):
+    """Static gain shaped to broadcast against the frequency axis.
+
+    Parameters
+    ----------
+    gain : float or array
+        The static gain, or an array of S gains for a batch of args.
+    s : array
+        The complex frequencies.
+
+    Returns
+    -------
+    float or array
+        The gain, with one trailing axis per axis of ``s``.
+    """
+    return np.reshape(gain, np.shape(gain) + (1,)*np.ndim(s))
+
+
 def _x2s(x, xunit):
     """Converts the independent variable to the complex variable s.
 
@@ -23,6 +23,10 @@ class SpectrumZPKFit(CurveFit):
     where ``bounds`` is [(min(xdata), max(xdata)] * (nzeros + npoles),
     and appended with [(min(ydata), max(ydata)].
     The bounds are np.log10() if log_args is true in the model.
+    If the default cost is used with a vectorized model,
+    e.g. ``SimpleZPK``, and neither ``workers`` nor ``vectorized``
+    is specified, ``workers`` is replaced by ``"vectorized": True``
+    and each generation is evaluated in one broadcast model call.
     All of these can be overridden if specified.
 
     Parameters
@@ -117,7 +121,8 @@ class SpectrumZPKFit(CurveFit):
         """
         if cost is None:
             error_func = kontrol.curvefit.error_func.spectrum_error
-            default_error_func_kwargs = {"weight": weight}
+            # axis=-1 gives one error per spectrum for a batch of args.
+            default_error_func_kwargs = {"weight": weight, "axis": -1}
             if error_func_kwargs is None:
                 error_func_kwargs = default_error_func_kwargs
             else:
@@ -125,6 +130,9 @@ class SpectrumZPKFit(CurveFit):
                     default_error_func_kwargs, **error_func_kwargs)
             cost = kontrol.curvefit.cost.Cost(
                 error_func=error_func, error_func_kwargs=error_func_kwargs)
+            default_cost = cost
+        else:
+            default_cost = None
 
         if optimizer is None:
             optimizer = scipy.optimize.differential_evolution
@@ -146,10 +154,15 @@ class SpectrumZPKFit(CurveFit):
             "workers": -1, "updating": "deferred", "bounds": bounds}
         if optimizer_kwargs is None:
             optimizer_kwargs = default_optimizer_kwargs
+            default_workers = True
         else:
+            default_workers = ("workers" not in optimizer_kwargs
+                               and "vectorized" not in optimizer_kwargs)
             optimizer_kwargs = dict(
                 default_optimizer_kwargs, **optimizer_kwargs)
 
+        self._default_cost = default_cost
+        self._default_workers = default_workers
         super().__init__(
             xdata, ydata, model, model_kwargs,
             cost, optimizer, optimizer_kwargs)
@@ -246,6 +259,28 @@ class SpectrumZPKFit(CurveFit):
     def prefit(self):
         """Something to do before fitting"""
         np.random.seed(self.seed)
+        self._update_population_evaluation()
+
+    def _update_population_evaluation(self):
+        """Evaluate the population in batches if possible.
+
+        The default ``"workers": -1`` is swapped with
+        ``"vectorized": True`` if the default cost is used with
+        a vectorized model, and swapped back otherwise.
+        """
+        differential_evolution = scipy.optimize.differential_evolution
+        if (not self._default_workers
+                or self.optimizer is not differential_evolution):
+            return
+        optimizer_kwargs = dict(self.optimizer_kwargs)
+        if (self.cost is self._default_cost
+                and getattr(self.model, "vectorized", False)):
+            optimizer_kwargs.pop("workers", None)
+            optimizer_kwargs["vectorized"] = True
+        else:
+            optimizer_kwargs.pop("vectorized", None)
+            optimizer_kwargs["workers"] = -1
+        self.optimizer_kwargs = optimizer_kwargs
 
 
 class SpectrumTFFit(CurveFit):
@@ -366,7 +401,8 @@ class SpectrumTFFit(CurveFit):
         """
         if cost is None:
             error_func = kontrol.curvefit.error_func.spectrum_error
-            default_error_func_kwargs = {"weight": weight}
+            # axis=-1 gives one error per spectrum for a batch of args.
+            default_error_func_kwargs = {"weight": weight, "axis": -1}
             if error_func_kwargs is None:
                 error_func_kwargs = default_error_func_kwargs
             else:
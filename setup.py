@@ -28,7 +28,8 @@ setuptools.setup(
         'matplotlib',
         'control>=0.9'
     ],
-    extra_requires={
-        "ezca":["ezca"]
+    extras_require={
+        "ezca":["ezca"],
+        "joblib":["joblib"]
     },
 )
@@ -67,3 +67,38 @@ def test_complementary_filter():
     # tf_correct = control.tf([1, 2.08392466e+04, 1.58200377e+04, 2.53883414e+03, 1.16522184e+02], [1, 2.08679038e+04, 1.64005175e+04, 5.55127674e+03, 8.50146586e+02])
     # assert kontrol.core.controlutils.check_tf_equal(
     #     tf_correct, comp[0, 0], allclose_kwargs={"rtol":1e-4})
+
+
+def test_synthesis_batch():
+    noise1 = control.tf([1/10, 1], [1/0.1, 1]) *10
+    noise2 = control.tf([1/0.1, 1], [1/10, 1])
+
+    comp = kontrol.ComplementaryFilter()
+    comp.noise1 = noise1
+    comp.noise2 = noise2
+    weight1_list = [1/noise2, 2/noise2]
+    weight2_list = [1/noise1, 1/noise1]
+    func = kontrol.complementary_filter.synthesis.hinfcomplementary
+    filter_pairs = comp._synthesis_batch(
+        func=func, weight1_list=weight1_list, weight2_list=weight2_list)
+
+    assert len(filter_pairs) == 2
+    for (filter1, filter2), weight1, weight2 in zip(
+            filter_pairs, weight1_list, weight2_list):
+        comp.weight1 = weight1
+        comp.weight2 = weight2
+        filter1_correct, filter2_correct = comp.hinfsynthesis()
+        assert kontrol.core.controlutils.check_tf_equal(
+            filter1, filter1_correct)
+        assert kontrol.core.controlutils.check_tf_equal(
+            filter2, filter2_correct)
+
+
+def test_complementary_filter_slots():
+    comp = kontrol.ComplementaryFilter()
+    assert not hasattr(comp, "__dict__")
+    try:
+        comp.undefined_attribute = 1
+        raise
+    except AttributeError:
+        pass
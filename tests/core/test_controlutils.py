@@ -49,6 +49,15 @@ def test_check_tf_equal():
         zeros=[1, 2, 3], poles=[4, 5, 6], gain=7, unit="omega")
     assert kontrol.core.controlutils.check_tf_equal(tf1, tf2)
 
+    # A real root and a complex pair sharing the same real part,
+    # with coefficient noise that reorders np.sort_complex().
+    den = np.array([1., 3, 4, 2])
+    tf1 = control.tf(1, den)
+    tf2 = control.tf(1, den*(1+1e-14*np.array([0, 1, 0, 0])))
+    assert kontrol.core.controlutils.check_tf_equal(tf1, tf2, minreal=False)
+    assert not kontrol.core.controlutils.check_tf_equal(
+        tf1, control.tf(1, [1, 3, 4, 3]))
+
 
 def test_generic_tf():
     f = np.logspace(-2, 3, 1000)
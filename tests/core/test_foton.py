@@ -95,3 +95,47 @@ def test_foton2tf():
     kontrol.core.foton.foton2tf(foton_string_n)
     kontrol.core.foton.foton2tf(foton_string_s)
     kontrol.core.foton.foton2tf(foton_string_f)
+
+
+def test_zpk2tf_parse():
+    """Tests the Foton zpk string parser in kontrol.core.foton.zpk2tf()"""
+    tf = kontrol.core.foton.zpk2tf(
+        "zpk([1;2+i*3;2-i*3],[4;5e1+i*-6;5e1+i*6],7)")
+    tf_spaced = kontrol.core.foton.zpk2tf(
+        ' zpk( [1; 2 + i*3; 2 - i*3], [4; 5e1+i*-6; 5e1+i*6], 7, "s" ) ')
+    assert np.allclose(tf.num[0][0], tf_spaced.num[0][0])
+    assert np.allclose(tf.den[0][0], tf_spaced.den[0][0])
+    assert np.allclose(np.sort_complex(tf.zeros()), [1, 2-3j, 2+3j])
+    tf_negative = kontrol.core.foton.zpk2tf("zpk([-2+i*3;-2-i*3],[-1],1)")
+    assert np.allclose(np.sort_complex(tf_negative.zeros()), [-2-3j, -2+3j])
+
+    try:
+        kontrol.core.foton.zpk2tf("zpk([1;2+j3],[4],7)")
+        raise
+    except ValueError:
+        pass
+
+
+def test_foton2tf_cache():
+    """Tests that cached Foton strings give independent transfer functions"""
+    foton_string = "zpk([1;2+i*3;2-i*3],[4;5+i*6;5-i*6],7,\"n\")"
+    tf1 = kontrol.core.foton.foton2tf(foton_string)
+    tf1.num[0][0][0] = 0
+    tf2 = kontrol.core.foton.foton2tf(foton_string)
+    assert tf2 is not tf1
+    assert tf2.num[0][0][0] != 0
+
+
+def test_tf2foton_batch():
+    """Tests for kontrol.core.foton.tf2foton_batch()"""
+    tfs = [tf_test, 1/(s+1), s/(s**2+s+1)]
+    foton_expressions = kontrol.core.foton.tf2foton_batch(
+        tfs, root_location="n")
+    assert foton_expressions == [
+        kontrol.core.foton.tf2foton(tf, root_location="n") for tf in tfs]
+
+    try:
+        kontrol.core.foton.tf2foton_batch(tfs, root_location="a")
+        raise
+    except ValueError:
+        pass
@@ -30,8 +30,9 @@ def test_log_mse():
         b, a, small_multiplier=1)
     test_zero_handle = (correct==test_zero_value_array_ab and
                         correct==test_zero_value_array_ba)
+    test_not_modified = not np.any(a)  # Inputs are not modified in place.
 
-    assert np.all([test_cal, test_zero_handle])
+    assert np.all([test_cal, test_zero_handle, test_not_modified])
 
 
 def test_quad_sum():
@@ -48,3 +49,9 @@ def test_polyval():
     p = [1, 2, 3]
     test = kontrol.core.math.polyval(p, x)
     assert np.allclose(correct, test)
+
+    # Long arrays take the Horner loop instead.
+    x = np.linspace(0, 1, 1000)*1j
+    correct = 1*x**2 + 2*x + 3
+    test = kontrol.core.math.polyval(p, x)
+    assert np.allclose(correct, test)
@@ -71,6 +71,13 @@ def test_two_channel_correlation():
     """
     _, coh = scipy.signal.coherence(y1, y2, fs=fs)
     P_n1 = kontrol.spectral.two_channel_correlation(psd=P_y1, coh=coh)
+    assert np.allclose(P_n1, P_y1*(1-coh**0.5))
+
+    # Scalars and a psd broadcasting wider than coh.
+    assert kontrol.spectral.two_channel_correlation(2., 0.25) == 1
+    P_n = kontrol.spectral.two_channel_correlation(
+        np.ones((2, 3)), np.full(3, 0.25))
+    assert np.allclose(P_n, 0.5*np.ones((2, 3)))
 
 
 def test_three_channel_correlation():
@@ -111,6 +118,14 @@ def test_three_channel_correlation():
     P_n1, P_n2, P_n3 = kontrol.spectral.three_channel_correlation(
         P_n1, P_n2, P_n3, csd31=csd31, csd32=csd32, csd12=csd12)
     
+    # Scalars and a psd broadcasting wider than the csds.
+    assert kontrol.spectral.three_channel_correlation(
+        2., csd13=1., csd23=2., csd21=1., returnall=False) == 1.5
+    P_n = kontrol.spectral.three_channel_correlation(
+        np.ones((2, 3)), csd13=np.ones(3), csd23=2*np.ones(3),
+        csd21=np.ones(3), returnall=False)
+    assert np.allclose(P_n, 0.5*np.ones((2, 3)))
+
     # Test raises
     try:
         kontrol.spectral.three_channel_correlation(P_y1)
@@ -167,6 +182,9 @@ def test_asd2rms():
     asd = pyy**0.5
     rms = kontrol.spectral.asd2rms(asd=asd, f=f)
     assert np.isclose(1, rms[0], rtol=1e-2)
+    i = len(f) // 2  # Integrated from the highest frequency.
+    assert np.isclose(rms[i], np.sqrt(np.trapz(asd[i:]**2, x=f[i:])))
+    assert rms[-1] == 0
 
     rms = kontrol.spectral.asd2rms(asd=asd, f=f, return_series=False)
     assert np.isclose(1, rms, rtol=1e-2)
@@ -93,3 +93,31 @@ def test_complex_zpk_model():
     test1 = np.allclose(tf_val, kontrol_zpk_val)
     test2 = np.allclose(tf_val, kontrol_zpk.tf(1j*2*np.pi*f))
     assert all([test1, test2])
+
+
+def test_zpk_model_tf_cache():
+    """Tests the cached tf of the ZPK models"""
+    kontrol_zpk = kontrol.curvefit.model.SimpleZPK(nzero=2, npole=3)
+    kontrol_zpk.args = np.array([1, 2, 3, 4, 5, 6])
+    tf1 = kontrol_zpk.tf
+    tf1.num[0][0][0] = 0  # Modifying the returned tf must not leak.
+    tf2 = kontrol_zpk.tf
+    assert tf2.num[0][0][0] != 0
+    assert np.isclose(tf2.dcgain(), 6)
+    kontrol_zpk.args = np.array([1, 2, 3, 4, 5, 7])
+    assert np.isclose(kontrol_zpk.tf.dcgain(), 7)
+    # Arguments modified in place are picked up as well.
+    args = np.array([1, 2, 3, 4, 5, 6], dtype=float)
+    kontrol_zpk.args = args
+    assert np.isclose(kontrol_zpk.tf.dcgain(), 6)
+    args[-1] = 7
+    assert np.isclose(kontrol_zpk.tf.dcgain(), 7)
+    kontrol_zpk.args[-1] = 9
+    assert np.isclose(kontrol_zpk.tf.dcgain(), 9)
+
+    kontrol_zpk = kontrol.curvefit.model.ComplexZPK(
+        nzero_pairs=1, npole_pairs=1)
+    kontrol_zpk.args = np.array([1, 2, 3, 4, 5], dtype=float)
+    assert np.isclose(kontrol_zpk.tf.dcgain(), 5)
+    kontrol_zpk.args[-1] = 9
+    assert np.isclose(kontrol_zpk.tf.dcgain(), 9)
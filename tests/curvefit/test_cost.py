@@ -17,3 +17,39 @@ def test_cost():
     cost.error_func_kwargs = kwargs
     _cost = cost(args, model=model, xdata=xdata, ydata=ydata)
     assert not _cost
+
+
+def test_cost_batch():
+    def model(x, args):
+        return args[0]*x**2
+    xdata = np.linspace(-1, 1, 1024)
+    ydata = model(xdata, [1])
+    cost = kontrol.curvefit.Cost(error_func=mse)
+    args = np.array([[1, 2, 3]])  # 1 parameter, 3 parameter sets.
+    _cost = cost(args, model=model, xdata=xdata, ydata=ydata)
+    assert _cost.shape == (3,)
+    assert np.allclose(
+        _cost, [cost([arg], model=model, xdata=xdata, ydata=ydata)
+                for arg in [1, 2, 3]])
+
+
+def test_cost_vectorized_model():
+    model = kontrol.curvefit.model.SimpleZPK(nzero=1, npole=2)
+    xdata = np.logspace(-1, 1, 100)
+    ydata = abs(model(xdata, [1, 2, 3, 4]))
+    cost = kontrol.curvefit.Cost(
+        error_func=kontrol.curvefit.error_func.spectrum_error,
+        error_func_kwargs={"axis": -1})
+    args = np.array([[1, 2, 3, 4], [1, 2, 3, 5], [2, 2, 3, 4]]).T
+    _cost = cost(args, model=model, xdata=xdata, ydata=ydata)
+    assert np.allclose(
+        _cost, [cost(arg, model=model, xdata=xdata, ydata=ydata)
+                for arg in args.T])
+
+    # Error functions that do not give one error per parameter set.
+    cost.error_func_kwargs = {}
+    try:
+        cost(args, model=model, xdata=xdata, ydata=ydata)
+        raise
+    except ValueError:
+        pass
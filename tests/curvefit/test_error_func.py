@@ -42,6 +42,12 @@ def test_noise_error():
     test_cal = correct==test
     assert test_cal
 
+    # Scalars and weights broadcasting wider than the spectra.
+    assert np.isclose(kontrol.curvefit.error_func.noise_error(1., 10.), 1)
+    test = kontrol.curvefit.error_func.noise_error(
+        a, b, weight=np.ones((2, len(a))))
+    assert np.isclose(test, 1)
+
 
 def test_spectrum_error():
     correct = 1
@@ -30,6 +30,16 @@ def test_spectrum_zpk_fit():
     tf_fit.model = model
     tf_fit.fit()
     assert np.allclose(10**tf_fit.optimized_args, [1, 1], rtol=1e-3)
+    # The default cost with a ZPK model evaluates the population at once.
+    assert tf_fit.optimizer_kwargs["vectorized"]
+    assert "workers" not in tf_fit.optimizer_kwargs
+
+    # Other costs are evaluated by the workers.
+    tf_fit.cost = kontrol.curvefit.Cost(
+        error_func=kontrol.curvefit.error_func.spectrum_error)
+    tf_fit.prefit()
+    assert tf_fit.optimizer_kwargs["workers"] == -1
+    assert "vectorized" not in tf_fit.optimizer_kwargs
 
 def test_spectrum_tf_fit():
     # Prepare data